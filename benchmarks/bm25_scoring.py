@@ -0,0 +1,90 @@
+"""
+Compares SparseBM25 with rank-bm25 (used by Langchain's BM25Retriever) on synthetic corpora.
+
+Usage:
+    python benchmarks/bm25_scoring.py --sizes 10000 100000 1000000 --queries 100
+
+Both engines use the same tokenizer. Reported times are index build time and mean latency
+per query for single queries and for one batched call.
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from rank_bm25 import BM25Okapi
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from elsai_core.retrievers.bm25_index import tokenize
+from elsai_core.retrievers.sparse_bm25 import SparseBM25
+
+
+def make_corpus(size, vocabulary_size, words_per_chunk, seed=0):
+    """
+    Generate chunks whose word frequencies follow a Zipf distribution, like natural text.
+    """
+    rng = np.random.default_rng(seed)
+    words = np.array([f"w{index}" for index in range(vocabulary_size)])
+    lengths = rng.integers(words_per_chunk // 2, words_per_chunk * 3 // 2, size=size)
+    ids = np.minimum(rng.zipf(1.2, size=int(lengths.sum())) - 1, vocabulary_size - 1)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    return [" ".join(words[ids[offsets[i]:offsets[i + 1]]]) for i in range(size)]
+
+
+def make_queries(count, vocabulary_size, seed=1):
+    rng = np.random.default_rng(seed)
+    return [" ".join(f"w{word}" for word in rng.integers(0, min(vocabulary_size, 5000), size=4)) for _ in range(count)]
+
+
+def bench_rank_bm25(corpus, queries, k):
+    started = time.perf_counter()
+    engine = BM25Okapi([tokenize(text) for text in corpus])
+    build = time.perf_counter() - started
+    started = time.perf_counter()
+    for query in queries:
+        scores = engine.get_scores(tokenize(query))
+        np.argsort(scores)[::-1][:k]
+    return build, (time.perf_counter() - started) / len(queries), None
+
+
+def bench_sparse(corpus, queries, k):
+    started = time.perf_counter()
+    engine = SparseBM25(corpus)
+    build = time.perf_counter() - started
+    started = time.perf_counter()
+    for query in queries:
+        engine.search(query, k)
+    single = (time.perf_counter() - started) / len(queries)
+    started = time.perf_counter()
+    engine.search_batch(queries, k)
+    batched = (time.perf_counter() - started) / len(queries)
+    return build, single, batched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SparseBM25 against rank-bm25.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--vocabulary", type=int, default=50000)
+    parser.add_argument("--words-per-chunk", type=int, default=120)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--rank-bm25-max-size", type=int, default=1000000,
+                        help="Skip rank-bm25 above this corpus size (it needs minutes and many GB at 1M)")
+    args = parser.parse_args()
+
+    queries = make_queries(args.queries, args.vocabulary)
+    print(f"{'chunks':>9} {'engine':>11} {'build s':>9} {'query ms':>9} {'batch ms/q':>11}")
+    for size in args.sizes:
+        corpus = make_corpus(size, args.vocabulary, args.words_per_chunk)
+        engines = [("sparse", bench_sparse)]
+        if size <= args.rank_bm25_max_size:
+            engines.append(("rank-bm25", bench_rank_bm25))
+        for name, bench in engines:
+            build, single, batched = bench(corpus, queries, args.k)
+            batched = f"{batched * 1000:>11.2f}" if batched is not None else f"{'-':>11}"
+            print(f"{size:>9} {name:>11} {build:>9.2f} {single * 1000:>9.2f} {batched}")
+
+
+if __name__ == "__main__":
+    main()
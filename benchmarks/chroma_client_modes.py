@@ -0,0 +1,110 @@
+"""
+Compares ingest and query throughput of ChromaVectorDb over HTTP and with the embedded persistent client.
+
+Usage:
+    python benchmarks/chroma_client_modes.py --host localhost --port 8000
+
+The HTTP mode is skipped when no host is given (or CHROMA_HOST is unset). The embedded client
+writes to a fresh temporary directory that is removed afterwards; a directory given with
+--persist-path is kept, and only the benchmark's own collections are deleted from it.
+"""
+import os
+import sys
+import time
+import uuid
+import random
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from elsai_core.vectordb import ChromaVectorDb
+
+
+def make_documents(count, dimensions, files):
+    """
+    Build random documents in the shape expected by ChromaVectorDb.add_document.
+    """
+    rng = random.Random(42)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "embeddings": [rng.random() for _ in range(dimensions)],
+            "page_content": f"chunk {index}",
+            "metadatas": {"file_id": f"file-{index % files}"},
+        }
+        for index in range(count)
+    ]
+
+
+def run(db, documents, queries, k, batch_size):
+    """
+    Ingest the documents into a fresh collection and run the queries one by one and batched.
+    """
+    collection_name = f"bench-{uuid.uuid4().hex[:8]}"
+    timings = {}
+    try:
+        started = time.perf_counter()
+        db.add_documents(documents, collection_name, batch_size=batch_size)
+        timings["ingest docs/s"] = len(documents) / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for embedding in queries:
+            db.retrieve_document(collection_name, embedding, k=k, include=["documents", "distances"])
+        timings["query q/s"] = len(queries) / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        db.retrieve_documents(collection_name, queries, k=k, include=["documents", "distances"])
+        timings["batched query q/s"] = len(queries) / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        db.fetch_chunks(collection_name, ["file-0", "file-1"])
+        timings["fetch_chunks s"] = time.perf_counter() - started
+    finally:
+        db.delete_collection(collection_name)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ChromaVectorDb HTTP and embedded modes.")
+    parser.add_argument("--persist-path", default=None,
+                        help="Directory for the embedded client (default: a temporary directory, removed afterwards)")
+    parser.add_argument("--host", default=os.getenv("CHROMA_HOST"), help="ChromaDB server host for the HTTP mode")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--documents", type=int, default=20000)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--files", type=int, default=100, help="Distinct file_id values in the metadata")
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    documents = make_documents(args.documents, args.dimensions, args.files)
+    queries = [document["embeddings"] for document in random.Random(7).sample(documents, args.queries)]
+
+    persist_path = args.persist_path or tempfile.mkdtemp(prefix="chroma-bench-")
+    modes = {"embedded": lambda: ChromaVectorDb(persist_path=persist_path, embedded=True)}
+    if args.host:
+        modes["http"] = lambda: ChromaVectorDb(chroma_host=args.host, chroma_port=args.port, embedded=False)
+    else:
+        print("No --host given; skipping the HTTP mode.")
+
+    results = {}
+    try:
+        for mode, factory in modes.items():
+            print(f"Running {mode} mode...")
+            results[mode] = run(factory(), documents, queries, args.k, args.batch_size)
+    finally:
+        # Only remove a directory this script created
+        if args.persist_path is None:
+            shutil.rmtree(persist_path, ignore_errors=True)
+
+    metrics = list(next(iter(results.values())))
+    print(f"\n{'metric':<20}" + "".join(f"{mode:>12}" for mode in results))
+    for metric in metrics:
+        print(f"{metric:<20}" + "".join(f"{results[mode][metric]:>12.1f}" for mode in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,51 @@
 import os
+import time
+import threading
 import requests
-def get_access_token():
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Refresh tokens this many seconds before they expire
+TOKEN_EXPIRY_MARGIN = 300
+
+_token_cache = {}
+_token_lock = threading.Lock()
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Returns a process-wide requests session with keep-alive connection pooling and
+    retries (with backoff) on throttling and transient server errors.
+    Returns:
+        requests.Session: Shared session for SharePoint and Graph API requests.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=5,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=("GET", "POST"),
+                    respect_retry_after_header=True,
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(max_retries=retry, pool_connections=10, pool_maxsize=32)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def get_access_token(force_refresh: bool = False):
     """
     Retrieves an OAuth2 access token for SharePoint using client credentials.
+    Tokens are cached per tenant and client until shortly before they expire.
+    Args:
+        force_refresh (bool): Ignore the cached token and request a new one.
     Returns:
         str: Access token for authenticating SharePoint API requests.
     Raises:
@@ -11,16 +54,25 @@ def get_access_token():
     tenant_id = os.getenv("TENANT_ID")
     client_id = os.getenv("CLIENT_ID")
     client_secret = os.getenv("CLIENT_SECRET")
-    token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
-    data = {
-        "grant_type": "client_credentials",
-        "client_id": client_id,
-        "client_secret": client_secret,
-        "scope": "https://graph.microsoft.com/.default",
-    }
-    response = requests.post(token_url, data=data, timeout=15)
-
-    if response.status_code == 200:
-        return response.json().get("access_token")
-    raise requests.exceptions.RequestException("Failed to acquire access token.")
-    
\ No newline at end of file
+    cache_key = (tenant_id, client_id)
+    with _token_lock:
+        cached = _token_cache.get(cache_key)
+        if cached and not force_refresh and cached[1] > time.time():
+            return cached[0]
+
+        token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
+        data = {
+            "grant_type": "client_credentials",
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "scope": "https://graph.microsoft.com/.default",
+        }
+        response = get_session().post(token_url, data=data, timeout=15)
+
+        if response.status_code == 200:
+            payload = response.json()
+            access_token = payload.get("access_token")
+            expires_in = int(payload.get("expires_in", 3599))
+            _token_cache[cache_key] = (access_token, time.time() + expires_in - TOKEN_EXPIRY_MARGIN)
+            return access_token
+        raise requests.exceptions.RequestException("Failed to acquire access token.")
@@ -10,6 +10,7 @@ from .database.postgresql_connector import PostgreSQLConnector
 from .database.odbcmysql_connector import OdbcMysqlConnector
 from .database.odbcpostgresql_connector import OdbcPostgresqlConnector
 from .database.sqlite_connector import SQLiteConnector
+from .database.result_sink import ExtractionResultSink
 __all__ = [
     'AwsS3Connector',
     'AzureBlobStorage',
@@ -18,5 +19,6 @@ __all__ = [
     'PostgreSQLConnector',
     'OdbcMysqlConnector',
     'OdbcPostgresqlConnector',
-    'SQLiteConnector'
+    'SQLiteConnector',
+    'ExtractionResultSink'
 ]
@@ -3,31 +3,52 @@ This module provides a connector for AWS S3 using boto3.
 """
 
 import os
+import copy
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from io import BytesIO
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from elsai_core.config.loggerConfig import setup_logger
 
+MB = 1024 * 1024
+
 class AwsS3Connector:
     """
     A connector class for interacting with AWS S3.
     """
 
-    def __init__(self, access_key: str = None, secret_key: str = None, session_token: str = None):
+    def __init__(self, access_key: str = None, secret_key: str = None, session_token: str = None,
+                 endpoint_url: str = None, max_pool_connections: int = 50,
+                 transfer_config: TransferConfig = None):
         """
         Initializes the S3Connector with AWS credentials.
 
         :param access_key: AWS access key ID
         :param secret_key: AWS secret access key
         :param session_token: AWS session token
+        :param endpoint_url: Custom S3 endpoint, e.g. a local S3 stand-in for testing
+        :param max_pool_connections: Size of the HTTP connection pool shared by concurrent transfers
+        :param transfer_config: Multipart transfer settings used for uploads and downloads
         """
         self.logger = setup_logger()
         self.access_key = access_key or os.getenv("AWS_ACCESS_KEY_ID", None)
         self.secret_key = secret_key or os.getenv("AWS_SECRET_ACCESS_KEY", None)
         self.session_token = session_token or os.getenv("AWS_SESSION_TOKEN", None)
+        self.max_pool_connections = max_pool_connections
         self.s3 = boto3.client(
             's3',
             aws_access_key_id=self.access_key,
             aws_secret_access_key=self.secret_key,
-            aws_session_token=self.session_token
+            aws_session_token=self.session_token,
+            endpoint_url=endpoint_url,
+            config=Config(max_pool_connections=max_pool_connections)
+        )
+        self.transfer_config = transfer_config or TransferConfig(
+            multipart_threshold=8 * MB,
+            multipart_chunksize=8 * MB,
+            max_concurrency=10,
+            use_threads=True
         )
 
     def upload_file_to_s3(self, bucket_name: str, s3_key: str, file_path: str):
@@ -35,7 +56,7 @@ class AwsS3Connector:
         Uploads a file to an S3 bucket.
         """
         try:
-            self.s3.upload_file(file_path, bucket_name, s3_key)
+            self.s3.upload_file(file_path, bucket_name, s3_key, Config=self.transfer_config)
             self.logger.info("File %s uploaded successfully to %s", file_path, s3_key)
             s3_uri = f"s3://{bucket_name}/{s3_key}"
             return s3_uri
@@ -54,6 +75,27 @@ class AwsS3Connector:
             self.logger.error("Error deleting file: %s", e)
             raise e
 
+    def delete_files_from_s3(self, bucket_name: str, s3_keys: list):
+        """
+        Deletes many files from an S3 bucket using bulk delete requests of up to 1000 keys.
+
+        :param bucket_name: Name of the S3 bucket
+        :param s3_keys: Keys of the objects to delete
+        """
+        try:
+            for start in range(0, len(s3_keys), 1000):
+                batch = s3_keys[start:start + 1000]
+                response = self.s3.delete_objects(
+                    Bucket=bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+                )
+                for error in response.get("Errors", []):
+                    self.logger.error("Error deleting file %s: %s", error.get("Key"), error.get("Message"))
+            self.logger.info("%d files deleted from %s", len(s3_keys), bucket_name)
+        except Exception as e:
+            self.logger.error("Error deleting files: %s", e)
+            raise e
+
     def download_file_from_s3(self, bucket_name: str, file_name: str, download_path: str):
         """
         Downloads a file from an S3 bucket to a specified local path.
@@ -65,8 +107,91 @@ class AwsS3Connector:
         raw_file_name = os.path.basename(file_name)
         download_path = os.path.join(download_path, raw_file_name)
         try:
-            self.s3.download_file(bucket_name, file_name, download_path)
+            self.s3.download_file(bucket_name, file_name, download_path, Config=self.transfer_config)
             self.logger.info("File %s downloaded successfully to %s", file_name, download_path)
         except Exception as e:
             self.logger.error("Error downloading file: %s", e)
             raise e
+
+    def list_objects(self, bucket_name: str, prefix: str = ""):
+        """
+        Lists the objects under a prefix, following pagination.
+
+        :param bucket_name: Name of the S3 bucket
+        :param prefix: Key prefix to list
+        :return: Generator of object summaries with 'Key', 'Size' and 'ETag'
+        """
+        paginator = self.s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+            yield from page.get("Contents", [])
+
+    def download_fileobj_from_s3(self, bucket_name: str, s3_key: str, transfer_config: TransferConfig = None) -> bytes:
+        """
+        Downloads an object into memory using ranged multipart GETs for large objects.
+
+        :param bucket_name: Name of the S3 bucket
+        :param s3_key: Key of the object to download
+        :param transfer_config: Transfer settings overriding the connector's for this download
+        :return: The object content
+        """
+        with BytesIO() as buffer:
+            self.s3.download_fileobj(bucket_name, s3_key, buffer, Config=transfer_config or self.transfer_config)
+            return buffer.getvalue()
+
+    def iter_objects(self, bucket_name: str, prefix: str = "", suffixes: tuple = None,
+                     max_workers: int = 8, max_in_flight_bytes: int = 256 * MB):
+        """
+        Streams the objects under a prefix into memory concurrently, without temp files.
+        Downloads are scheduled while the total size of objects being downloaded or waiting
+        to be consumed stays within max_in_flight_bytes; a single object larger than the
+        budget is still downloaded on its own.
+
+        The multipart concurrency of each download is capped so that all workers together
+        stay within max_pool_connections. An object that fails to download is logged and
+        skipped; the remaining objects are still yielded.
+
+        :param bucket_name: Name of the S3 bucket
+        :param prefix: Key prefix to ingest
+        :param suffixes: Optional key suffixes to keep, matched case-insensitively, e.g. (".pdf",)
+        :param max_workers: Number of objects downloaded concurrently
+        :param max_in_flight_bytes: Memory budget for objects in flight
+        :return: Generator of (key, bytes) tuples in completion order
+        """
+        suffixes = tuple(suffix.lower() for suffix in suffixes) if suffixes else None
+        transfer_config = copy.copy(self.transfer_config)
+        transfer_config.max_concurrency = max(
+            1, min(self.transfer_config.max_concurrency, self.max_pool_connections // max_workers)
+        )
+        in_flight = {}
+        in_flight_bytes = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for obj in self.list_objects(bucket_name, prefix):
+                key, size = obj["Key"], obj.get("Size", 0)
+                if key.endswith("/") or (suffixes and not key.lower().endswith(suffixes)):
+                    continue
+                while in_flight and (in_flight_bytes + size > max_in_flight_bytes or len(in_flight) >= max_workers):
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        done_key, done_size = in_flight.pop(future)
+                        in_flight_bytes -= done_size
+                        yield from self._completed_object(done_key, future)
+                future = executor.submit(self.download_fileobj_from_s3, bucket_name, key, transfer_config)
+                in_flight[future] = (key, size)
+                in_flight_bytes += size
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    done_key, _ = in_flight.pop(future)
+                    yield from self._completed_object(done_key, future)
+
+    def _completed_object(self, key: str, future):
+        """
+        Yields the (key, bytes) of a finished download, or logs its error and yields nothing.
+        """
+        try:
+            content = future.result()
+        except Exception as e:
+            self.logger.error("Error downloading file %s: %s", key, e)
+            return
+        yield key, content
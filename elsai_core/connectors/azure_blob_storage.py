@@ -3,26 +3,47 @@ This module provides a class for interacting with Azure Blob Storage.
 """
 
 import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from azure.storage.blob import BlobServiceClient
 from elsai_core.config.loggerConfig import setup_logger
 
+ETAG_MANIFEST = ".blob_etags.json"
+
+
 class AzureBlobStorage:
     """
     A class to handle Azure Blob Storage operations.
     """
-    def __init__(self, connection_string):
+    def __init__(self, connection_string, max_concurrency: int = 4):
         """
         Initialize the AzureBlobStorage with a connection string.
+
+        Args:
+            connection_string (str): Azure Storage connection string.
+            max_concurrency (int): Number of parallel range requests used per blob download.
         """
         self.connection_string = connection_string
+        self.max_concurrency = max_concurrency
         self.logger = setup_logger()
         self.blob_service_client = BlobServiceClient.from_connection_string(connection_string)
 
     def download_file(self, container_name, blob_name, target_folder_path):
         """
-        Download a file from Azure Blob Storage to a local directory.
+        Download a file from Azure Blob Storage to a local directory. The blob is
+        streamed to a ".part" file next to the target and moved into place once complete,
+        so a failed download never leaves a truncated file behind.
+
+        Returns:
+            str: Path of the downloaded file.
+
+        Raises:
+            ValueError: If the blob name would resolve outside target_folder_path.
+            Exception: If the download fails.
         """
-        file_path = os.path.join(target_folder_path, blob_name)
+        file_path = self._local_path(target_folder_path, blob_name)
+        partial_file_path = f"{file_path}.part"
         blob_client = self.blob_service_client.get_blob_client(
             container=container_name, blob=blob_name
         )
@@ -30,11 +51,118 @@ class AzureBlobStorage:
             self.logger.info(
                 "Downloading blob '%s' to local file '%s'...", blob_name, file_path
             )
-            with open(file_path, "wb") as file:
-                file.write(blob_client.download_blob().readall())
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            with open(partial_file_path, "wb") as file:
+                blob_client.download_blob(max_concurrency=self.max_concurrency).readinto(file)
+            os.replace(partial_file_path, file_path)
 
             self.logger.info(
                 "Blob '%s' successfully downloaded to '%s'.", blob_name, file_path
             )
-        except Exception as e:  
-            self.logger.error("Error: %s", e)
+            return file_path
+        except Exception as e:
+            self.logger.error("Error downloading blob '%s': %s", blob_name, e)
+            if os.path.exists(partial_file_path):
+                os.remove(partial_file_path)
+            raise
+
+    def download_to_memory(self, container_name, blob_name) -> bytes:
+        """
+        Download a blob into memory using parallel range requests.
+
+        Returns:
+            bytes: The blob content.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container=container_name, blob=blob_name
+        )
+        try:
+            with BytesIO() as buffer:
+                blob_client.download_blob(max_concurrency=self.max_concurrency).readinto(buffer)
+                return buffer.getvalue()
+        except Exception as e:
+            self.logger.error("Error downloading blob '%s': %s", blob_name, e)
+            raise
+
+    def download_container(self, container_name, target_folder_path, prefix=None,
+                           max_workers: int = 8, skip_unchanged: bool = True) -> dict:
+        """
+        Download every blob under a prefix to a local directory with a bounded worker pool.
+
+        When skip_unchanged is set, the ETag of each downloaded blob is recorded in a
+        manifest in the target folder and blobs whose ETag has not changed since the
+        last run are not downloaded again.
+
+        Args:
+            container_name (str): Name of the container.
+            target_folder_path (str): Local directory to download into.
+            prefix (str, optional): Only download blobs whose name starts with this prefix.
+            max_workers (int): Number of blobs downloaded concurrently.
+            skip_unchanged (bool): Skip blobs whose ETag matches the previous download.
+
+        Returns:
+            dict: Mapping of blob name to local file path for the blobs downloaded in this run.
+        """
+        os.makedirs(target_folder_path, exist_ok=True)
+        manifest_path = os.path.join(target_folder_path, ETAG_MANIFEST)
+        manifest = self._load_manifest(manifest_path) if skip_unchanged else {}
+        container_client = self.blob_service_client.get_container_client(container_name)
+
+        pending = []
+        skipped = 0
+        for blob in container_client.list_blobs(name_starts_with=prefix):
+            try:
+                local_path = self._local_path(target_folder_path, blob.name)
+            except ValueError as e:
+                self.logger.error("Skipping blob '%s': %s", blob.name, e)
+                continue
+            if skip_unchanged and manifest.get(blob.name) == blob.etag and os.path.exists(local_path):
+                skipped += 1
+                continue
+            pending.append(blob)
+        self.logger.info(
+            "Downloading %d blobs from '%s' (%d unchanged skipped).", len(pending), container_name, skipped
+        )
+
+        downloaded = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                blob.name: (blob.etag, executor.submit(self.download_file, container_name, blob.name, target_folder_path))
+                for blob in pending
+            }
+            for blob_name, (etag, future) in futures.items():
+                try:
+                    downloaded[blob_name] = future.result()
+                    manifest[blob_name] = etag
+                except Exception as e:
+                    self.logger.error("Error downloading blob '%s': %s", blob_name, e)
+
+        if skip_unchanged:
+            with open(manifest_path, "w", encoding="utf-8") as file:
+                json.dump(manifest, file)
+        return downloaded
+
+    @staticmethod
+    def _local_path(target_folder_path, blob_name) -> str:
+        """
+        Resolve the local path of a blob, rejecting names such as '../x' or '/etc/x'
+        that would land outside the target folder.
+        """
+        target_folder = os.path.realpath(target_folder_path)
+        file_path = os.path.realpath(os.path.join(target_folder, blob_name))
+        if os.path.commonpath([target_folder, file_path]) != target_folder or file_path == target_folder:
+            raise ValueError(f"Blob name '{blob_name}' resolves outside '{target_folder_path}'.")
+        return file_path
+
+    def _load_manifest(self, manifest_path) -> dict:
+        """
+        Load the ETag manifest written by a previous download_container run.
+        """
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            self.logger.error("Ignoring unreadable ETag manifest '%s': %s", manifest_path, e)
+            return {}
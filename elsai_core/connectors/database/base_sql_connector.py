@@ -2,8 +2,27 @@
 This module provides a base SQL connector class for interacting with SQL databases.
 """   
 from langchain_community.agent_toolkits import create_sql_agent
-from langchain_community.utilities import SQLDatabase
 from .dialects import Dialects
+from .query_cache import QueryCache, register_query_cache
+from .schema_cache import CachedSQLDatabase, get_engine
+from .table_selector import TableSelector
+
+def build_connection_string(
+        dialect: str,
+        database_name: str,
+        database_url: str = "",
+        database_user: str = "",
+        database_password: str = "",
+        driver_name: str = None
+) -> str:
+    """
+    Builds the SQLAlchemy connection string for one of the supported dialects.
+    """
+    if dialect == Dialects.ODBCMYSQL.value or dialect == Dialects.ODBCPOSTGRES.value:
+        return f"{dialect}://{database_user}:{database_password}@{database_url}/{database_name}?driver={driver_name}"
+    if dialect == Dialects.SQLITE.value:
+        return f"{dialect}:///{database_name}"
+    return f"{dialect}://{database_user}:{database_password}@{database_url}/{database_name}"
 
 class BaseSQLConnector:
     """
@@ -17,10 +36,33 @@ class BaseSQLConnector:
             database_url: str="",
             database_user: str="",
             database_password: str="",
-            driver_name: str = None
+            driver_name: str = None,
+            include_tables: list = None,
+            pool_size: int = 5,
+            max_overflow: int = 10,
+            pool_pre_ping: bool = True,
+            schema_cache_ttl: int = 3600,
+            schema_cache_dir: str = None,
+            table_selection_k: int = None,
+            use_query_cache: bool = False,
+            query_cache: QueryCache = None
     ):
         """
         Initializes the SQL connector with the given parameters.
+
+        Engines are shared per connection string, tables are reflected lazily (optionally
+        limited to include_tables) and reflected table info is cached on disk for
+        schema_cache_ttl seconds.
+
+        When table_selection_k is set and the database has more usable tables than that,
+        each question is answered by an agent that only sees the k most relevant tables
+        (ranked with BM25 over table and column names), with their schema included up front.
+
+        With use_query_cache, the SQL generated for each normalized question and the rows it
+        returns are cached (see QueryCache), so repeated questions skip the agent entirely.
+        Only answers built from a single SQL query are cached. Writes made through
+        ExtractionResultSink invalidate the affected tables; other writers must call
+        invalidate_tables, otherwise results may be stale for up to the cache's result TTL.
         """
         self.llm = llm
         self.dialect = dialect
@@ -29,16 +71,145 @@ class BaseSQLConnector:
         self.database_user = database_user
         self.database_password = database_password
         self.driver_name = driver_name
-        if self.dialect == Dialects.ODBCMYSQL.value or self.dialect == Dialects.ODBCPOSTGRES.value:
-            self.db_connection_string = f"{self.dialect}://{self.database_user}:{self.database_password}@{self.database_url}/{self.database_name}?driver={self.driver_name}"
-        elif self.dialect == Dialects.SQLITE.value:
-            self.db_connection_string = f"{self.dialect}:///{self.database_name}"
-        else:
-            self.db_connection_string = f"{self.dialect}://{self.database_user}:{self.database_password}@{self.database_url}/{self.database_name}"
+        self.db_connection_string = build_connection_string(
+            self.dialect, self.database_name, self.database_url,
+            self.database_user, self.database_password, self.driver_name
+        )
         
-        self.db = SQLDatabase.from_uri(self.db_connection_string)
-        self.agent_executor = create_sql_agent(llm=self.llm, db=self.db, agent_type="openai-tools")
+        self.engine = get_engine(
+            self.db_connection_string,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=pool_pre_ping
+        )
+        self.db = CachedSQLDatabase(
+            self.engine,
+            cache_key=self.db_connection_string,
+            cache_ttl=schema_cache_ttl,
+            cache_dir=schema_cache_dir,
+            include_tables=include_tables
+        )
+        self.agent_executor = self._create_agent(self.db)
+        self.query_cache = (query_cache or QueryCache()) if use_query_cache else None
+        if self.query_cache is not None:
+            register_query_cache(self.db_connection_string, self.query_cache)
+        self.table_selection_k = table_selection_k
+        self.schema_cache_ttl = schema_cache_ttl
+        self.schema_cache_dir = schema_cache_dir
+        self._table_selector = None
+        self._scoped_agents = {}
 
     def invoke(self, query: str):
-        result = self.agent_executor.invoke(query)
-        return result['output']
\ No newline at end of file
+        if self.query_cache is not None:
+            cached_answer = self._answer_from_cache(query)
+            if cached_answer is not None:
+                return cached_answer
+
+        tables = self.select_tables(query) if self.table_selection_k else []
+        if tables:
+            agent_executor, table_info = self._get_scoped_agent(tables)
+            result = agent_executor.invoke(
+                f"{query}\n\nThe relevant tables and their schema are:\n{table_info}"
+            )
+        else:
+            result = self.agent_executor.invoke(query)
+
+        if self.query_cache is not None:
+            sql, rows = self._single_sql_query(result.get('intermediate_steps', []))
+            if sql:
+                self._cache_result(sql, rows)
+                self.query_cache.put_sql(query, sql, rows, result['output'])
+        return result['output']
+
+    def invalidate_tables(self, tables: list):
+        """
+        Drops cached query results that read any of the given tables, e.g. after writing to them.
+        """
+        if self.query_cache is not None:
+            self.query_cache.invalidate_tables(tables)
+
+    def _answer_from_cache(self, query: str):
+        """
+        Answers a repeated question from the cache. The cached SQL is re-run when its rows
+        have expired; if the rows changed, the answer is rephrased from the new rows with a
+        single LLM call instead of a full agent run. Returns None on a cache miss.
+        """
+        cached = self.query_cache.get_sql(query)
+        if cached is None:
+            return None
+        sql, rows, answer = cached
+        current_rows = self.query_cache.get_result(sql)
+        if current_rows is None:
+            try:
+                current_rows = self.db.run(sql)
+            except Exception:
+                return None
+            self._cache_result(sql, current_rows)
+        if current_rows == rows:
+            return answer
+
+        response = self.llm.invoke(
+            "Answer the question using the result of the SQL query.\n"
+            f"Question: {query}\nSQL query: {sql}\nSQL result: {current_rows}\nAnswer:"
+        )
+        answer = getattr(response, "content", response)
+        self.query_cache.put_sql(query, sql, current_rows, answer)
+        return answer
+
+    def _cache_result(self, sql: str, rows: str):
+        tables = QueryCache.referenced_tables(sql, self.db.get_usable_table_names())
+        self.query_cache.put_result(sql, rows, tables)
+
+    @staticmethod
+    def _single_sql_query(intermediate_steps: list):
+        """
+        Returns the (sql, rows) pair when the agent's answer rests on exactly one successful
+        query, and (None, None) otherwise: an answer combining several queries cannot be
+        replayed or rephrased from a single query's rows.
+        """
+        queries = []
+        for action, observation in intermediate_steps:
+            if getattr(action, "tool", None) != "sql_db_query":
+                continue
+            tool_input = action.tool_input
+            sql = tool_input.get("query") if isinstance(tool_input, dict) else tool_input
+            if sql and not str(observation).startswith("Error"):
+                queries.append((sql, str(observation)))
+        return queries[0] if len(queries) == 1 else (None, None)
+
+    def _create_agent(self, db):
+        return create_sql_agent(
+            llm=self.llm,
+            db=db,
+            agent_type="openai-tools",
+            agent_executor_kwargs={"return_intermediate_steps": True}
+        )
+
+    def select_tables(self, query: str) -> list:
+        """
+        Returns the tables most relevant to the query, or an empty list when the schema is
+        small enough to expose every table or nothing matches.
+        """
+        if self._table_selector is None:
+            self._table_selector = TableSelector(self.db.get_table_descriptions())
+        if len(self._table_selector.tables) <= self.table_selection_k:
+            return []
+        return self._table_selector.select(query, self.table_selection_k)
+
+    def _get_scoped_agent(self, tables: list):
+        """
+        Returns an agent (and the schema text) restricted to the given tables, reusing agents
+        built for the same table set.
+        """
+        key = frozenset(tables)
+        if key not in self._scoped_agents:
+            scoped_db = CachedSQLDatabase(
+                self.engine,
+                cache_key=self.db_connection_string,
+                cache_ttl=self.schema_cache_ttl,
+                cache_dir=self.schema_cache_dir,
+                include_tables=sorted(tables)
+            )
+            agent_executor = self._create_agent(scoped_db)
+            self._scoped_agents[key] = (agent_executor, scoped_db.get_table_info(sorted(tables)))
+        return self._scoped_agents[key]
\ No newline at end of file
@@ -13,9 +13,10 @@ class OdbcMysqlConnector(BaseSQLConnector):
             database_url: str = os.getenv("DB_URL"),
             database_user: str = os.getenv("DB_USER"),
             database_password: str = os.getenv("DB_PASSWORD"),
-            driver_name: str = os.getenv("DB_DRIVER_NAME")
+            driver_name: str = os.getenv("DB_DRIVER_NAME"),
+            **kwargs
         ):
         super().__init__(
             Dialects.ODBCMYSQL.value, llm, database_name, 
-            database_url, database_user, database_password, driver_name
+            database_url, database_user, database_password, driver_name, **kwargs
         )
@@ -12,9 +12,10 @@ class PostgreSQLConnector(BaseSQLConnector):
             database_name: str = os.getenv("DB_NAME"),
             database_url: str = os.getenv("DB_URL"),
             database_user: str = os.getenv("DB_USER"),
-            database_password: str = os.getenv("DB_PASSWORD")
+            database_password: str = os.getenv("DB_PASSWORD"),
+            **kwargs
         ):
         super().__init__(
             Dialects.POSTGRES.value, llm, database_name, 
-            database_url, database_user, database_password
+            database_url, database_user, database_password, **kwargs
         )
@@ -0,0 +1,193 @@
+"""
+This module provides a two-level cache for natural-language SQL queries:
+normalized question -> generated SQL, and SQL -> result rows.
+"""
+
+import re
+import time
+import weakref
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_$]*")
+
+# Connection string -> query caches of the connectors reading that database
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalizes a question so trivial variations (case, spacing, trailing punctuation)
+    map to the same cache entry.
+    """
+    return _WHITESPACE.sub(" ", question).strip().strip("?!. ").lower()
+
+
+class _TTLStore:
+    """
+    A thread-safe LRU mapping whose entries expire after a fixed TTL. on_remove, if given,
+    is called outside the lock with each key dropped by expiry or eviction.
+    """
+    def __init__(self, ttl: float, max_entries: int, on_remove: Optional[Callable] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.on_remove = on_remove
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            expired = expires_at < time.monotonic()
+            if expired:
+                del self._entries[key]
+            else:
+                self._entries.move_to_end(key)
+        if expired:
+            self._removed([key])
+            return None
+        return value
+
+    def put(self, key, value):
+        if self.ttl <= 0:
+            return
+        evicted = []
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+        self._removed(evicted)
+
+    def _removed(self, keys):
+        if self.on_remove:
+            for key in keys:
+                self.on_remove(key)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class QueryCache:
+    """
+    Caches the SQL generated for a question (long TTL) and the rows returned by that SQL
+    (short TTL). Result entries are invalidated per table when data changes.
+    """
+    def __init__(self, sql_ttl: float = 24 * 3600, result_ttl: float = 300, max_entries: int = 1024):
+        """
+        Args:
+            sql_ttl (float): Seconds a question -> SQL entry stays valid.
+            result_ttl (float): Seconds a SQL -> rows entry stays valid.
+            max_entries (int): Maximum entries kept per level (least recently used are evicted).
+        """
+        self._sql = _TTLStore(sql_ttl, max_entries)
+        self._results = _TTLStore(result_ttl, max_entries, on_remove=self._forget)
+        self._sql_by_table = {}
+        self._tables_by_sql = {}
+        self._lock = threading.Lock()
+
+    def get_sql(self, question: str) -> Optional[Tuple[str, str, str]]:
+        """
+        Returns (sql, rows, answer) recorded for the question when it was last answered, or None.
+        """
+        return self._sql.get(normalize_question(question))
+
+    def put_sql(self, question: str, sql: str, rows: str, answer: str):
+        """
+        Records the SQL generated for a question together with the rows and answer it produced.
+        """
+        self._sql.put(normalize_question(question), (sql, rows, answer))
+
+    def get_result(self, sql: str) -> Optional[str]:
+        """
+        Returns the cached rows for a SQL statement, or None.
+        """
+        return self._results.get(sql.strip())
+
+    def put_result(self, sql: str, rows: str, tables: Iterable[str]):
+        """
+        Caches the rows of a SQL statement and records the tables it reads for invalidation.
+        """
+        if self._results.ttl <= 0:
+            return
+        sql = sql.strip()
+        tables = {table.lower() for table in tables}
+        self._results.put(sql, rows)
+        with self._lock:
+            self._tables_by_sql.setdefault(sql, set()).update(tables)
+            for table in tables:
+                self._sql_by_table.setdefault(table, set()).add(sql)
+
+    def invalidate_tables(self, tables: Iterable[str]):
+        """
+        Drops the cached rows of every SQL statement that reads any of the given tables.
+        """
+        with self._lock:
+            statements = set()
+            for table in tables:
+                statements |= self._sql_by_table.get(table.lower(), set())
+        for sql in statements:
+            self._results.pop(sql)
+            self._forget(sql)
+
+    def clear(self):
+        """
+        Drops all cached entries.
+        """
+        self._sql.clear()
+        self._results.clear()
+        with self._lock:
+            self._sql_by_table.clear()
+            self._tables_by_sql.clear()
+
+    def _forget(self, sql: str):
+        """
+        Removes a statement whose rows left the cache from the per-table map.
+        """
+        with self._lock:
+            for table in self._tables_by_sql.pop(sql, ()):
+                statements = self._sql_by_table.get(table)
+                if statements is not None:
+                    statements.discard(sql)
+                    if not statements:
+                        del self._sql_by_table[table]
+
+    @staticmethod
+    def referenced_tables(sql: str, table_names: Iterable[str]) -> set:
+        """
+        Returns the known table names that appear as identifiers in a SQL statement.
+        """
+        identifiers = {identifier.lower() for identifier in _IDENTIFIER.findall(sql)}
+        return {table for table in table_names if table.lower() in identifiers}
+
+
+def register_query_cache(connection_string: str, cache: QueryCache):
+    """
+    Registers a connector's query cache so writes to the same database can invalidate it.
+    Caches are held weakly and drop out of the registry with their connector.
+    """
+    with _registry_lock:
+        _registry.setdefault(connection_string, weakref.WeakSet()).add(cache)
+
+
+def invalidate_query_caches(connection_string: str, tables: Iterable[str]):
+    """
+    Drops cached rows reading any of the given tables from every query cache registered
+    for the database, e.g. after a writer changed those tables.
+    """
+    tables = list(tables)
+    with _registry_lock:
+        caches = list(_registry.get(connection_string, ()))
+    for cache in caches:
+        cache.invalidate_tables(tables)
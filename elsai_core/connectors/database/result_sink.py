@@ -0,0 +1,327 @@
+"""
+This module provides a sink that writes extracted invoices and timesheets to SQL tables in batches.
+"""
+
+import io
+import csv
+import re
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, Text, event
+from elsai_core.config.loggerConfig import setup_logger
+from .dialects import Dialects
+from .query_cache import invalidate_query_caches
+from .schema_cache import get_engine
+
+_LABEL = re.compile(r"[^a-z0-9]+")
+
+# Normalized markdown labels -> invoice header columns
+HEADER_FIELDS = {
+    "invoice_number": "invoice_number",
+    "invoice_no": "invoice_number",
+    "invoice_date": "invoice_date",
+    "invoice_terms": "invoice_terms",
+    "terms": "invoice_terms",
+    "due_date": "due_date",
+    "company_name": "company_name",
+    "company_address": "company_address",
+    "company_phone_number": "company_phone",
+    "company_email": "company_email",
+    "client_name": "client_name",
+    "client_address": "client_address",
+    "bank_name": "bank_name",
+    "bsb": "bsb",
+    "bsb_bank_state_branch": "bsb",
+    "account_number": "account_number",
+    "sub_total": "sub_total",
+    "subtotal": "sub_total",
+    "gst": "gst",
+    "total_amount": "total_amount",
+}
+
+# Normalized markdown column headers -> line item columns
+LINE_ITEM_FIELDS = {
+    "job_order_no": "job_order_no",
+    "purchase_order_no": "purchase_order_no",
+    "payee_name": "payee_name",
+    "weekending_date": "weekending_date",
+    "description": "description",
+    "item": "item",
+    "quantity": "quantity",
+    "rate": "rate",
+    "invoice_amount_ex_tax": "amount",
+    "invoice_amount": "amount",
+    "amount": "amount",
+}
+
+# Normalized markdown column headers -> timesheet attendance columns
+ATTENDANCE_FIELDS = {
+    "date": "work_date",
+    "start_time": "start_time",
+    "end_time": "end_time",
+    "finish_time": "end_time",
+    "attendance_absence_type": "attendance_type",
+    "total_hours": "total_hours",
+    "customer_name": "customer_name",
+}
+
+
+def normalize_label(label: str) -> str:
+    """
+    Normalizes a markdown field label or column header, e.g. "**Invoice Amount (ex. Tax)**" -> "invoice_amount_ex_tax".
+    """
+    return _LABEL.sub("_", label.lower()).strip("_")
+
+
+def parse_markdown_tables(markdown: str) -> List[List[Dict[str, str]]]:
+    """
+    Parses the pipe tables of a markdown document.
+
+    Returns:
+        List[List[Dict[str, str]]]: One list of rows per table, each row keyed by the column header.
+    """
+    tables = []
+    lines = [line.strip() for line in markdown.splitlines()]
+    index = 0
+    while index < len(lines) - 1:
+        header, separator = lines[index], lines[index + 1]
+        if header.startswith("|") and separator.startswith("|") and set(separator) <= set("|-: "):
+            columns = [cell.strip() for cell in header.strip("|").split("|")]
+            rows = []
+            index += 2
+            while index < len(lines) and lines[index].startswith("|"):
+                cells = [cell.strip() for cell in lines[index].strip("|").split("|")]
+                rows.append(dict(zip(columns, cells)))
+                index += 1
+            tables.append(rows)
+        else:
+            index += 1
+    return tables
+
+
+def map_extraction(markdown: str) -> Dict[str, Any]:
+    """
+    Maps the markdown tables produced by the extraction prompts to normalized records.
+
+    Two-column field/value tables feed the invoice header; row tables with rate or amount
+    columns become invoice line items, and row tables with date and start/end time columns
+    become timesheet attendance rows.
+
+    Returns:
+        Dict[str, Any]: {"header": {...}, "line_items": [...], "attendance": [...]}
+    """
+    header, extra_fields, line_items, attendance = {}, {}, [], []
+    for rows in parse_markdown_tables(markdown):
+        if not rows:
+            continue
+        columns = [normalize_label(column) for column in rows[0]]
+        if len(columns) == 2:
+            for row in rows:
+                cells = [cell.strip("* ") for cell in row.values()]
+                if len(cells) < 2:
+                    continue
+                label, value = cells
+                if not value or value.upper() == "N/A":
+                    continue
+                field = HEADER_FIELDS.get(normalize_label(label))
+                if field:
+                    header[field] = value
+                else:
+                    extra_fields[label] = value
+            continue
+        if {"rate", "quantity"} & set(columns) or any(column.startswith("invoice_amount") for column in columns):
+            line_items.extend(_map_rows(rows, LINE_ITEM_FIELDS))
+        elif "date" in columns and ({"start_time", "end_time", "finish_time"} & set(columns)):
+            attendance.extend(_map_rows(rows, ATTENDANCE_FIELDS))
+    if extra_fields:
+        header["extra_fields"] = json.dumps(extra_fields)
+    return {"header": header, "line_items": line_items, "attendance": attendance}
+
+
+def _map_rows(rows: List[Dict[str, str]], fields: Dict[str, str]) -> List[Dict[str, Any]]:
+    mapped = []
+    for row in rows:
+        record, extra = {}, {}
+        for column, value in row.items():
+            value = value.strip("* ")
+            field = fields.get(normalize_label(column))
+            if field:
+                record[field] = value
+            elif value:
+                extra[column] = value
+        if extra:
+            record["extra_fields"] = json.dumps(extra)
+        mapped.append(record)
+    return mapped
+
+
+class ExtractionResultSink:
+    """
+    Writes extraction results to normalized SQL tables (documents, invoice headers,
+    invoice line items and timesheet attendance rows) using batched inserts.
+
+    Rows are keyed on the document hash: writing a document again replaces its rows.
+    Inserts use multi-row executemany, pyodbc fast_executemany on the ODBC dialects and
+    COPY on PostgreSQL via psycopg2.
+    """
+    def __init__(self, connection_string: str, batch_size: int = 500, create_tables: bool = True):
+        """
+        Args:
+            connection_string (str): SQLAlchemy URL, e.g. from build_connection_string.
+            batch_size (int): Number of documents written per transaction.
+            create_tables (bool): Create the result tables if they do not exist.
+        """
+        self.logger = setup_logger()
+        self.batch_size = batch_size
+        self.connection_string = connection_string
+        self.engine = get_engine(connection_string)
+        self.dialect = f"{self.engine.dialect.name}+{self.engine.dialect.driver}"
+        if self.dialect in (Dialects.ODBCMYSQL.value, Dialects.ODBCPOSTGRES.value):
+            if not event.contains(self.engine, "before_cursor_execute", _enable_fast_executemany):
+                event.listen(self.engine, "before_cursor_execute", _enable_fast_executemany)
+
+        self.metadata = MetaData()
+        self.documents = Table(
+            "extracted_documents", self.metadata,
+            Column("document_hash", String(64), primary_key=True),
+            Column("source", String(512)),
+            Column("document_type", String(64)),
+            Column("extracted_at", DateTime(timezone=True)),
+        )
+        self.invoice_headers = Table(
+            "invoice_headers", self.metadata,
+            Column("document_hash", String(64), primary_key=True),
+            *[Column(name, Text) for name in sorted(set(HEADER_FIELDS.values()))],
+            Column("extra_fields", Text),
+        )
+        self.invoice_line_items = Table(
+            "invoice_line_items", self.metadata,
+            Column("document_hash", String(64), primary_key=True),
+            Column("line_no", Integer, primary_key=True, autoincrement=False),
+            *[Column(name, Text) for name in sorted(set(LINE_ITEM_FIELDS.values()))],
+            Column("extra_fields", Text),
+        )
+        self.timesheet_attendance = Table(
+            "timesheet_attendance", self.metadata,
+            Column("document_hash", String(64), primary_key=True),
+            Column("row_no", Integer, primary_key=True, autoincrement=False),
+            *[Column(name, Text) for name in sorted(set(ATTENDANCE_FIELDS.values()))],
+            Column("extra_fields", Text),
+        )
+        if create_tables:
+            self.metadata.create_all(self.engine)
+
+    @classmethod
+    def from_connector(cls, connector, **kwargs):
+        """
+        Creates a sink that writes to the database of an existing SQL connector.
+        """
+        return cls(connector.db_connection_string, **kwargs)
+
+    def write_results(self, results: Iterable[Dict[str, Any]]) -> int:
+        """
+        Writes extraction results in batches.
+
+        Args:
+            results: Dicts with "document_hash", "source", "document_type" and either the
+                extraction "markdown" or already mapped "header", "line_items" and "attendance".
+
+        Returns:
+            int: Number of documents written.
+        """
+        written = 0
+        batch = []
+        for result in results:
+            batch.append(result)
+            if len(batch) >= self.batch_size:
+                written += self._write_batch(batch)
+                batch = []
+        if batch:
+            written += self._write_batch(batch)
+        return written
+
+    def _write_batch(self, results: List[Dict[str, Any]]) -> int:
+        now = datetime.now(timezone.utc)
+        documents, headers, line_items, attendance = {}, {}, [], []
+        for result in results:
+            document_hash = result["document_hash"]
+            mapped = map_extraction(result["markdown"]) if "markdown" in result else result
+            documents[document_hash] = {
+                "document_hash": document_hash,
+                "source": result.get("source"),
+                "document_type": result.get("document_type"),
+                "extracted_at": now,
+            }
+            # Later results for the same document in a batch replace earlier ones
+            line_items = [row for row in line_items if row["document_hash"] != document_hash]
+            attendance = [row for row in attendance if row["document_hash"] != document_hash]
+            headers.pop(document_hash, None)
+            if mapped.get("header"):
+                headers[document_hash] = self._row(self.invoice_headers, mapped["header"], document_hash=document_hash)
+            line_items.extend(
+                self._row(self.invoice_line_items, item, document_hash=document_hash, line_no=number)
+                for number, item in enumerate(mapped.get("line_items") or [], start=1)
+            )
+            attendance.extend(
+                self._row(self.timesheet_attendance, row, document_hash=document_hash, row_no=number)
+                for number, row in enumerate(mapped.get("attendance") or [], start=1)
+            )
+
+        hashes = list(documents)
+        with self.engine.begin() as connection:
+            for table in (self.timesheet_attendance, self.invoice_line_items, self.invoice_headers, self.documents):
+                connection.execute(table.delete().where(table.c.document_hash.in_(hashes)))
+            connection.execute(self.documents.insert(), list(documents.values()))
+            for table, rows in (
+                    (self.invoice_headers, list(headers.values())),
+                    (self.invoice_line_items, line_items),
+                    (self.timesheet_attendance, attendance)):
+                if rows:
+                    self._insert(connection, table, rows)
+        invalidate_query_caches(
+            self.connection_string,
+            [table.name for table in (self.documents, self.invoice_headers,
+                                      self.invoice_line_items, self.timesheet_attendance)]
+        )
+        self.logger.info(
+            "Wrote %d documents (%d line items, %d attendance rows).", len(hashes), len(line_items), len(attendance)
+        )
+        return len(hashes)
+
+    def _insert(self, connection, table: Table, rows: List[Dict[str, Any]]):
+        """
+        Inserts rows with COPY on PostgreSQL (psycopg2) and executemany elsewhere.
+        """
+        if self.dialect == Dialects.POSTGRES.value:
+            columns = [column.name for column in table.columns]
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow(["\\N" if row[column] is None else row[column] for column in columns])
+            buffer.seek(0)
+            cursor = connection.connection.cursor()
+            try:
+                cursor.copy_expert(
+                    f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                    buffer
+                )
+            finally:
+                cursor.close()
+        else:
+            connection.execute(table.insert(), rows)
+
+    @staticmethod
+    def _row(table: Table, values: Dict[str, Any], **keys) -> Dict[str, Any]:
+        row = {column.name: None for column in table.columns}
+        row.update({key: value for key, value in values.items() if key in row})
+        row.update(keys)
+        return row
+
+
+def _enable_fast_executemany(conn, cursor, statement, parameters, context, executemany):
+    """
+    Turns on pyodbc's fast_executemany for bulk inserts on ODBC connections.
+    """
+    if executemany and hasattr(cursor, "fast_executemany"):
+        cursor.fast_executemany = True
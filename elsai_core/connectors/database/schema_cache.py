@@ -0,0 +1,178 @@
+"""
+This module provides shared SQLAlchemy engines and a disk-backed cache of reflected table info.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import List, Optional
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import Engine
+from langchain_community.utilities import SQLDatabase
+from elsai_core.config.loggerConfig import setup_logger
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "elsai_core", "sql_schema")
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(
+        connection_string: str,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_pre_ping: bool = True,
+        pool_recycle: int = 1800
+) -> Engine:
+    """
+    Returns the engine for a connection string and pool settings, creating it on first use
+    so every connector for the same database and settings shares one connection pool.
+
+    Args:
+        connection_string (str): SQLAlchemy database URL.
+        pool_size (int): Number of connections kept open in the pool.
+        max_overflow (int): Connections allowed beyond pool_size under load.
+        pool_pre_ping (bool): Test connections before use to drop stale ones.
+        pool_recycle (int): Seconds after which connections are recycled.
+
+    Returns:
+        Engine: The shared SQLAlchemy engine.
+    """
+    key = (connection_string, pool_size, max_overflow, pool_pre_ping, pool_recycle)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            if connection_string.startswith("sqlite"):
+                # SQLite uses its own pool classes that do not accept pool sizing
+                engine = create_engine(connection_string)
+            else:
+                engine = create_engine(
+                    connection_string,
+                    pool_size=pool_size,
+                    max_overflow=max_overflow,
+                    pool_pre_ping=pool_pre_ping,
+                    pool_recycle=pool_recycle
+                )
+            _engines[key] = engine
+        return engine
+
+
+class CachedSQLDatabase(SQLDatabase):
+    """
+    SQLDatabase that reflects tables lazily and caches each table's info on disk, so
+    building a connector does not reflect the whole schema and repeated runs within
+    the TTL reuse the table info without touching the database catalog.
+
+    The cached table info includes the sample rows requested with sample_rows_in_table_info
+    (3 by default), i.e. real table data. The cache directory is created with 0700 and the
+    cache files with 0600 permissions; pass sample_rows_in_table_info=0 to keep data rows
+    out of the cache, or cache_ttl=0 to disable the disk cache.
+    """
+    def __init__(
+            self,
+            engine: Engine,
+            cache_key: str,
+            cache_ttl: int = 3600,
+            cache_dir: Optional[str] = None,
+            **kwargs
+    ):
+        """
+        Args:
+            engine (Engine): SQLAlchemy engine to use.
+            cache_key (str): Identifies the database; hashed to name the cache file.
+            cache_ttl (int): Seconds cached table info stays valid. 0 disables the disk cache.
+            cache_dir (str, optional): Cache directory. Defaults to SQL_SCHEMA_CACHE_DIR or ~/.cache.
+            **kwargs: Passed to SQLDatabase, e.g. include_tables or sample_rows_in_table_info.
+        """
+        kwargs.setdefault("lazy_table_reflection", True)
+        super().__init__(engine, **kwargs)
+        self.logger = setup_logger()
+        self.cache_ttl = cache_ttl
+        cache_dir = cache_dir or os.getenv("SQL_SCHEMA_CACHE_DIR", DEFAULT_CACHE_DIR)
+        # Table info does not depend on include_tables, so scoped instances share one cache file
+        key = json.dumps([cache_key, kwargs.get("schema"), kwargs.get("sample_rows_in_table_info", 3)])
+        self.cache_path = os.path.join(cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+        self._cache_created_at = None
+        self._table_descriptions = None
+        self._table_info_cache = self._load_cache()
+        self._cache_lock = threading.Lock()
+
+    def get_table_info(self, table_names: Optional[List[str]] = None) -> str:
+        """
+        Returns the info for the given tables, reflecting only tables missing from the cache.
+        """
+        table_names = list(table_names) if table_names else list(self.get_usable_table_names())
+        with self._cache_lock:
+            missing = [name for name in table_names if name not in self._table_info_cache]
+            if missing:
+                self.logger.info("Reflecting %d tables not found in the schema cache.", len(missing))
+                for name in missing:
+                    self._table_info_cache[name] = super().get_table_info([name])
+                self._save_cache()
+        return "\n\n".join(self._table_info_cache[name] for name in table_names)
+
+    def get_table_descriptions(self) -> dict:
+        """
+        Returns a short text description (table name, comment and column names) of every
+        usable table, read with bulk catalog queries and kept in the disk cache.
+
+        Returns:
+            dict: Mapping of table name to its description.
+        """
+        with self._cache_lock:
+            usable = set(self.get_usable_table_names())
+            if self._table_descriptions is None or not usable.issubset(self._table_descriptions):
+                self.logger.info("Reading column names for %d tables.", len(usable))
+                inspector = inspect(self._engine)
+                columns = inspector.get_multi_columns(schema=self._schema)
+                comments = {}
+                if self._engine.dialect.supports_comments:
+                    try:
+                        comments = inspector.get_multi_table_comment(schema=self._schema)
+                    except NotImplementedError:
+                        self.logger.info("Table comments are not available for this database.")
+                descriptions = {}
+                for (schema, table), table_columns in columns.items():
+                    if table not in usable:
+                        continue
+                    comment = (comments.get((schema, table)) or {}).get("text") or ""
+                    descriptions[table] = " ".join(
+                        [table, comment] + [f"{column['name']} {column.get('comment') or ''}" for column in table_columns]
+                    )
+                self._table_descriptions = descriptions
+                self._save_cache()
+            return {table: self._table_descriptions[table] for table in usable if table in self._table_descriptions}
+
+    def _load_cache(self) -> dict:
+        if not self.cache_ttl or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.error("Ignoring unreadable schema cache %s: %s", self.cache_path, e)
+            return {}
+        if time.time() - cached.get("created_at", 0) > self.cache_ttl:
+            self.logger.info("Schema cache %s expired.", self.cache_path)
+            return {}
+        self._cache_created_at = cached["created_at"]
+        self._table_descriptions = cached.get("descriptions")
+        return cached.get("tables", {})
+
+    def _save_cache(self):
+        if not self.cache_ttl:
+            return
+        if self._cache_created_at is None:
+            self._cache_created_at = time.time()
+        os.makedirs(os.path.dirname(self.cache_path), mode=0o700, exist_ok=True)
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        # Owner-only permissions: the table info contains sample rows
+        with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f:
+            json.dump({
+                "created_at": self._cache_created_at,
+                "tables": self._table_info_cache,
+                "descriptions": self._table_descriptions
+            }, f)
+        os.replace(tmp_path, self.cache_path)
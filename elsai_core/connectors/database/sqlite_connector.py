@@ -6,8 +6,8 @@ class SQLiteConnector(BaseSQLConnector):
     A connector class for sqlite3 databases.
     """
 
-    def __init__(self, llm, database_path:str = os.getenv("DB_NAME")):
+    def __init__(self, llm, database_path:str = os.getenv("DB_NAME"), **kwargs):
         super().__init__(
-    Dialects.SQLITE.value, llm=llm, database_name=database_path
+    Dialects.SQLITE.value, llm=llm, database_name=database_path, **kwargs
         )
         
\ No newline at end of file
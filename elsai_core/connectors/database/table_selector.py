@@ -0,0 +1,45 @@
+"""
+This module provides BM25-based selection of the tables relevant to a question.
+"""
+
+import re
+from typing import Dict, List
+from rank_bm25 import BM25Okapi
+
+_CAMEL_CASE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into lowercase tokens, breaking snake_case and camelCase identifiers
+    so that "invoice_line_items" and "InvoiceLineItems" both match "invoice items".
+    """
+    return _TOKEN.findall(_CAMEL_CASE.sub(" ", text).replace("_", " ").lower())
+
+
+class TableSelector:
+    """
+    Ranks database tables against a natural-language question using a BM25 index over
+    table names, comments and column names.
+    """
+    def __init__(self, table_descriptions: Dict[str, str]):
+        """
+        Args:
+            table_descriptions (Dict[str, str]): Mapping of table name to description text.
+        """
+        self.tables = sorted(table_descriptions)
+        corpus = [tokenize(table_descriptions[table]) or [table.lower()] for table in self.tables]
+        self.index = BM25Okapi(corpus) if corpus else None
+
+    def select(self, question: str, k: int = 5) -> List[str]:
+        """
+        Returns the names of the k tables most relevant to the question, best first.
+        Tables with no term overlap are never returned.
+        """
+        tokens = tokenize(question)
+        if self.index is None or not tokens:
+            return []
+        scores = self.index.get_scores(tokens)
+        ranked = sorted(range(len(self.tables)), key=lambda i: scores[i], reverse=True)
+        return [self.tables[i] for i in ranked[:k] if scores[i] > 0]
@@ -3,17 +3,96 @@ This module provides services to interact with SharePoint, including retrieving
 """
 
 from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
 import os
+import json
+import threading
 import requests
 from elsai_core.config.loggerConfig import setup_logger
-from elsai_core.config.sharepoint_auth_service import get_access_token
+from elsai_core.config.sharepoint_auth_service import get_access_token, get_session
+
+GRAPH_URL = "https://graph.microsoft.com/v1.0"
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DELTA_STATE_FILE = ".sharepoint_delta.json"
+
+# Site and drive IDs do not change, so they are resolved once per process
+_site_ids = {}
+_drive_ids = {}
+_id_lock = threading.Lock()
+
 
 class SharePointService:
     """
     A service class to interact with SharePoint for file retrieval and download.
     """
-    def __init__(self):
+    def __init__(self, session: requests.Session = None):
         self.logger = setup_logger()
+        self.session = session or get_session()
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Sends an authenticated GET request through the shared session, refreshing the
+        cached access token once if it has been revoked or expired early.
+        """
+        kwargs.setdefault("timeout", 10)
+        response = self.session.get(url, headers={"Authorization": f"Bearer {get_access_token()}"}, **kwargs)
+        if response.status_code == 401:
+            self.logger.info("Access token rejected, requesting a new one.")
+            response.close()
+            response = self.session.get(
+                url, headers={"Authorization": f"Bearer {get_access_token(force_refresh=True)}"}, **kwargs
+            )
+        response.raise_for_status()
+        return response
+
+    def _get_paged(self, url: str, params: dict = None):
+        """
+        Yields the items of a Graph collection, following @odata.nextLink pagination.
+        """
+        while url:
+            payload = self._get(url, params=params).json()
+            yield from payload.get("value", [])
+            url = payload.get("@odata.nextLink")
+            # nextLink already carries the original query parameters
+            params = None
+
+    def get_site_id(self) -> str:
+        """
+        Resolves the SharePoint site ID for SITE_HOSTNAME and SITE_PATH, memoized per process.
+        """
+        site_hostname = os.getenv("SITE_HOSTNAME")
+        site_path = os.getenv("SITE_PATH")
+        key = (site_hostname, site_path)
+        with _id_lock:
+            if key not in _site_ids:
+                site_url = f"{GRAPH_URL}/sites/{site_hostname}:{site_path}"
+                self.logger.info("Making GET request to %s for site info.", site_url)
+                _site_ids[key] = self._get(site_url).json()["id"]
+                self.logger.info("Successfully retrieved site ID: %s", _site_ids[key])
+            return _site_ids[key]
+
+    def get_drive_id(self) -> str:
+        """
+        Resolves the drive ID for DRIVE_NAME in the configured site, memoized per process.
+
+        Raises:
+            ValueError: If the drive does not exist in the site.
+        """
+        site_id = self.get_site_id()
+        drive_name = os.getenv("DRIVE_NAME")
+        key = (site_id, drive_name)
+        with _id_lock:
+            if key not in _drive_ids:
+                self.logger.info("Fetching drives information.")
+                drives = self._get(f"{GRAPH_URL}/sites/{site_id}/drives").json()["value"]
+                drive_id = next((drive["id"] for drive in drives if drive["name"] == drive_name), None)
+                if not drive_id:
+                    site_path = os.getenv("SITE_PATH")
+                    self.logger.error("Drive '%s' not found in site '%s'.", drive_name, site_path)
+                    raise ValueError(f"Drive '{drive_name}' not found in site '{site_path}'.")
+                self.logger.info("Found drive ID: %s for drive name: %s", drive_id, drive_name)
+                _drive_ids[key] = drive_id
+            return _drive_ids[key]
 
     def retrieve_sharepoint_files_from_folder(self, folder_name: str) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -39,46 +118,12 @@ class SharePointService:
                        site ID retrieval, drive ID retrieval, or folder/file access.
         """
         try:
-            # Step 1: Get Site ID
-            self.logger.info("Getting access token...")
-            access_token = get_access_token()
             self.logger.info("Starting to retrieve files from SharePoint folder: %s", folder_name)
-            self.logger.info("Fetching site information")
-
-            site_hostname = os.getenv("SITE_HOSTNAME")
-            site_path = os.getenv("SITE_PATH")
-            site_url = f"https://graph.microsoft.com/v1.0/sites/{site_hostname}:{site_path}"
-            headers = {"Authorization": f"Bearer {access_token}"}
-            self.logger.info("Making GET request to %s for site info.", site_url)
-            response = requests.get(site_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            site_id = response.json()["id"]
-
-            self.logger.info("Successfully retrieved site ID: %s", site_id)
-
-            # Step 2: Get Drive ID
-            self.logger.info("Fetching drives information.")
-            drives_url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives"
-            response = requests.get(drives_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            drives = response.json()["value"]
-            
-            self.logger.info("Drives available: %s", drives)
-            drive_name = os.getenv("DRIVE_NAME")
-
-            drive_id = next((drive["id"] for drive in drives if drive["name"] == drive_name), None)
-            if not drive_id:
-                self.logger.error("Drive '%s' not found in site '%s'.", drive_name, site_path)
-                raise ValueError(f"Drive '{drive_name}' not found in site '{site_path}'.")
-
-            self.logger.info("Found drive ID: %s for drive name: %s", drive_id, drive_name)
-
-            # Step 3: Fetch Files in Folder
+            drive_id = self.get_drive_id()
+
             self.logger.info("Fetching files in folder: %s", folder_name)
-            folder_url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}/root:/{folder_name}:/children"
-            response = requests.get(folder_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            files = response.json().get("value", [])
+            folder_url = f"{GRAPH_URL}/drives/{drive_id}/root:/{folder_name}:/children"
+            files = list(self._get_paged(folder_url, params={"$select": "id,name,file"}))
             if not files:
                 self.logger.warning("No files found in folder: %s", folder_name)
             files_info = []
@@ -107,43 +152,43 @@ class SharePointService:
             self.logger.error("Unexpected error: %s", str(e))
             raise
 
-    def download_file_from_sharepoint(self, file_id: str, target_folder: str):
+    def download_file_from_sharepoint(self, file_id: str, target_folder: str, file_name: str = None):
         """
         Download a file from SharePoint using its file ID.
 
         Args:
             file_id (str): The ID of the file to download.
+            target_folder (str): Local folder to save the file in.
+            file_name (str, optional): Name to save the file as, e.g. the "file-name" returned
+                by retrieve_sharepoint_files_from_folder. When omitted, the name is looked up.
 
         Returns:
-            bytes: The binary content of the downloaded file.
+            str: Path of the downloaded file. The content is streamed to disk in chunks.
 
         Raises:
             Exception: If file download fails.
         """
         try:
-            self.logger.info("Getting access token...")
-            access_token = get_access_token()
-            headers = {"Authorization": f"Bearer {access_token}"}
-            drive_id = os.getenv("DRIVE_ID")
-            download_url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}/items/{file_id}/content"
+            drive_id = os.getenv("DRIVE_ID") or self.get_drive_id()
+            download_url = f"{GRAPH_URL}/drives/{drive_id}/items/{file_id}/content"
             self.logger.info("Downloading file with ID: %s", file_id)
-            
-            response = requests.get(download_url, headers=headers, timeout=10)
-            response.raise_for_status()
-           
+
             self.logger.info("Writing file....")
-            metadata_url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}/items/{file_id}"
-            metadata_response = requests.get(metadata_url, headers=headers, timeout=10)
-            metadata_response.raise_for_status()
-            file_name = metadata_response.json().get("name")
+            if file_name is None:
+                metadata_url = f"{GRAPH_URL}/drives/{drive_id}/items/{file_id}"
+                file_name = self._get(metadata_url, params={"$select": "name"}).json().get("name")
             if not os.path.exists(target_folder):
                 os.makedirs(target_folder)
                 self.logger.info("Created folder: %s", target_folder)
             local_file_path = os.path.join(target_folder, file_name)
+            partial_file_path = f"{local_file_path}.part"
 
-            with open(local_file_path, 'wb') as f:
-                f.write(response.content)
-                self.logger.info("File Saved Successfully")
+            with self._get(download_url, stream=True, timeout=60) as response:
+                with open(partial_file_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+            os.replace(partial_file_path, local_file_path)
+            self.logger.info("File Saved Successfully")
             return local_file_path
         
         except requests.exceptions.RequestException as e:
@@ -152,3 +197,139 @@ class SharePointService:
         except Exception as e:
             self.logger.error("Unexpected error: %s", str(e))
             raise
+
+    def download_files_from_sharepoint(self, files: List[Dict[str, Any]], target_folder: str,
+                                       max_workers: int = 8) -> Dict[str, str]:
+        """
+        Download many files in parallel with a bounded worker pool.
+
+        Args:
+            files (List[Dict[str, Any]]): File entries with "file-id" and "file-name" keys, as
+                returned by retrieve_sharepoint_files_from_folder.
+            target_folder (str): Local folder to save the files in.
+            max_workers (int): Number of concurrent downloads.
+
+        Returns:
+            Dict[str, str]: Mapping of file ID to local file path for the files that were downloaded.
+        """
+        downloaded = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                file["file-id"]: executor.submit(
+                    self.download_file_from_sharepoint, file["file-id"], target_folder, file.get("file-name")
+                )
+                for file in files
+            }
+            for file_id, future in futures.items():
+                try:
+                    downloaded[file_id] = future.result()
+                except Exception as e:
+                    self.logger.error("Failed to download file %s: %s", file_id, str(e))
+        return downloaded
+
+    def sync_folder(self, folder_name: str, target_folder: str, state_path: str = None,
+                    max_workers: int = 8) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Incrementally sync the files of a SharePoint folder to a local folder using Graph delta
+        queries. The delta link is persisted between runs, so only files that were added or
+        whose content changed since the previous sync are downloaded.
+
+        Args:
+            folder_name (str): The name of the folder in the SharePoint Document Library.
+            target_folder (str): Local folder to save the files in.
+            state_path (str, optional): Path of the sync state file. Defaults to a file in target_folder.
+            max_workers (int): Number of concurrent downloads.
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: {"files": [...], "deleted": [...]} where "files" lists the
+            downloaded files ("file-name", "file-id", "local-path") and "deleted" lists the IDs of
+            files removed from the folder since the previous sync.
+        """
+        os.makedirs(target_folder, exist_ok=True)
+        state_path = state_path or os.path.join(target_folder, DELTA_STATE_FILE)
+        state = self._load_delta_state(state_path, folder_name)
+        drive_id = self.get_drive_id()
+        if not state["folder_id"]:
+            folder_url = f"{GRAPH_URL}/drives/{drive_id}/root:/{folder_name}"
+            state["folder_id"] = self._get(folder_url, params={"$select": "id"}).json()["id"]
+
+        try:
+            items, delta_link = self._get_delta(drive_id, state["delta_link"])
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code != 410:
+                raise
+            self.logger.warning("Delta link expired, resyncing folder: %s", folder_name)
+            items, delta_link = self._get_delta(drive_id, None)
+
+        changed = []
+        deleted = []
+        for item in items:
+            if (item.get("parentReference") or {}).get("id") != state["folder_id"]:
+                continue
+            file_id = item["id"]
+            if item.get("deleted"):
+                if state["files"].pop(file_id, None) is not None:
+                    deleted.append(file_id)
+                continue
+            if not item.get("file"):
+                continue
+            known = state["files"].get(file_id)
+            local_path = os.path.join(target_folder, item["name"])
+            if known and known["cTag"] == item.get("cTag") and os.path.exists(local_path):
+                continue
+            changed.append({"file-name": item["name"], "file-id": file_id, "cTag": item.get("cTag")})
+
+        self.logger.info(
+            "Delta sync of %s: %d new or changed files, %d deleted", folder_name, len(changed), len(deleted)
+        )
+        downloaded = self.download_files_from_sharepoint(changed, target_folder, max_workers=max_workers)
+        files_info = []
+        for file in changed:
+            if file["file-id"] in downloaded:
+                state["files"][file["file-id"]] = {"name": file["file-name"], "cTag": file["cTag"]}
+                files_info.append({
+                    "file-name": file["file-name"],
+                    "file-id": file["file-id"],
+                    "local-path": downloaded[file["file-id"]]
+                })
+
+        # Only advance the delta link when every change was applied, so failures are retried
+        if len(downloaded) == len(changed):
+            state["delta_link"] = delta_link
+        with open(state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        return {"files": files_info, "deleted": deleted}
+
+    def _get_delta(self, drive_id: str, delta_link: str = None):
+        """
+        Reads all pages of a drive delta query and returns the changed items and the new delta link.
+        Delta queries on SharePoint are only supported on the drive root, so callers filter by parent.
+        """
+        url = delta_link or f"{GRAPH_URL}/drives/{drive_id}/root/delta"
+        params = None if delta_link else {"$select": "id,name,file,folder,deleted,cTag,parentReference"}
+        items = []
+        while True:
+            payload = self._get(url, params=params, timeout=30).json()
+            items.extend(payload.get("value", []))
+            if "@odata.nextLink" in payload:
+                url, params = payload["@odata.nextLink"], None
+                continue
+            return items, payload.get("@odata.deltaLink")
+
+    def _load_delta_state(self, state_path: str, folder_name: str) -> Dict[str, Any]:
+        """
+        Loads the persisted delta state for a folder, starting fresh if none exists.
+        """
+        empty_state = {"folder": folder_name, "folder_id": None, "delta_link": None, "files": {}}
+        if not os.path.exists(state_path):
+            return empty_state
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.error("Ignoring unreadable delta state %s: %s", state_path, str(e))
+            return empty_state
+        if state.get("folder") != folder_name:
+            self.logger.warning("Delta state %s belongs to another folder, starting a full sync.", state_path)
+            return empty_state
+        return state
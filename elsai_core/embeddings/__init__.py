@@ -1,5 +1,8 @@
-from .azure_openai_embedding_model import AzureOpenAIEmbeddingModel
+from .azure_openai_embedding_model import AzureOpenAIEmbeddingModel, EmbeddingResult
+from .embedding_cache import EmbeddingCache
 
 __all__ = [
-    "AzureOpenAIEmbeddingModel"
+    "AzureOpenAIEmbeddingModel",
+    "EmbeddingResult",
+    "EmbeddingCache"
 ]
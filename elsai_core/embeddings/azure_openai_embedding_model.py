@@ -1,6 +1,32 @@
 import os
+import time
+import random
+import asyncio
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from langchain_openai import AzureOpenAIEmbeddings
 from elsai_core.config.loggerConfig import setup_logger
+from .embedding_cache import EmbeddingCache, text_key
+
+
+@dataclass
+class EmbeddingResult:
+    """
+    Outcome of embedding a list of texts.
+
+    Attributes:
+        embeddings (list): One vector per input text, in input order; None for failed texts.
+        errors (dict): Maps the index of every failed input text to the error message.
+    """
+    embeddings: List[Optional[List[float]]]
+    errors: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """True when every text was embedded."""
+        return not self.errors
+
 
 class AzureOpenAIEmbeddingModel:
     """
@@ -12,8 +38,29 @@ class AzureOpenAIEmbeddingModel:
             azure_deployment: str = None,
             azure_endpoint: str = None,
             azure_api_key: str = None,
-            azure_api_version: str = None
+            azure_api_version: str = None,
+            use_cache: bool = True,
+            cache: EmbeddingCache = None,
+            batch_size: int = 256,
+            max_concurrency: int = 4,
+            max_retries: int = 3,
+            retry_backoff: float = 1.0
         ):
+        """
+        Args:
+            model (str): Embedding model name.
+            azure_deployment (str, optional): Deployment name. Defaults to AZURE_EMBEDDING_DEPLOYMENT_NAME.
+            azure_endpoint (str, optional): Endpoint. Defaults to AZURE_OPENAI_ENDPOINT.
+            azure_api_key (str, optional): API key. Defaults to AZURE_OPENAI_API_KEY.
+            azure_api_version (str, optional): API version. Defaults to OPENAI_API_VERSION.
+            use_cache (bool): Reuse embeddings of previously embedded texts. Defaults to True.
+            cache (EmbeddingCache, optional): Cache to use. Defaults to the on-disk cache at
+                EMBEDDING_CACHE_PATH or ~/.cache.
+            batch_size (int): Texts sent per embedding request. Defaults to 256.
+            max_concurrency (int): Embedding requests in flight at once. Defaults to 4.
+            max_retries (int): Retries of a failed batch before its texts are reported as failed.
+            retry_backoff (float): Base delay in seconds, doubled on every retry.
+        """
         self.logger = setup_logger()
         if azure_deployment is None:
             azure_deployment = os.getenv("AZURE_EMBEDDING_DEPLOYMENT_NAME")
@@ -30,6 +77,12 @@ class AzureOpenAIEmbeddingModel:
             api_key=azure_api_key,
             openai_api_version=azure_api_version
         )
+        self.cache = (cache or EmbeddingCache()) if use_cache else None
+        self.cache_namespace = f"{model}:{azure_deployment}"
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
 
     def embed_query(self, text: str) -> list:
         """Embeds the given text using Azure OpenAI's embed_query method,
@@ -37,7 +90,15 @@ class AzureOpenAIEmbeddingModel:
         """
         try:
             self.logger.info("Starting embedding process.")
+            key = text_key(text)
+            if self.cache:
+                cached = self.cache.get_many(self.cache_namespace, [key])
+                if key in cached:
+                    self.logger.info("Embedding found in cache.")
+                    return cached[key]
             embedding = self.azure_embeddings_model.embed_query(text)
+            if self.cache:
+                self.cache.put_many(self.cache_namespace, {key: embedding})
             self.logger.info("Embedding generated successfully.")
             return embedding
         except Exception as e:
@@ -46,16 +107,129 @@ class AzureOpenAIEmbeddingModel:
 
     def embed_documents(self, texts: list) -> list:
         """Embeds the given list of texts using Azure OpenAI's embed_documents method,
-          returning the embedding vectors.
+          returning the embedding vectors in input order.
+        Texts that could not be embedded after retries are returned as None and logged;
+        use embed_documents_with_errors to get the error of each failed text.
         """
-        try:
-            self.logger.info("Starting embedding process.")
-            embedding = self.azure_embeddings_model.embed_documents(texts)
+        result = self.embed_documents_with_errors(texts)
+        if result.errors:
+            self.logger.error("Embedding failed for %d of %d texts.", len(result.errors), len(texts))
+        return result.embeddings
+
+    def embed_documents_with_errors(self, texts: list) -> EmbeddingResult:
+        """Embeds the given list of texts in batches sent concurrently from a thread pool.
+        Texts are embedded once per distinct content: duplicates within the list are collapsed
+        and texts found in the embedding cache are not sent to the API. Each batch is retried
+        with exponential backoff; texts of batches that still fail are reported per item.
+        """
+        self.logger.info("Starting embedding process.")
+        keys, unique, vectors, batches = self._prepare(texts)
+        errors = {}
+        if batches:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                outcomes = executor.map(self._embed_batch, [[unique[key] for key in batch] for batch in batches])
+                for batch, (embedded, error) in zip(batches, outcomes):
+                    self._collect(unique, batch, embedded, error, vectors, errors)
+        return self._finish(keys, vectors, errors)
+
+    async def aembed_documents(self, texts: list) -> list:
+        """Async variant of embed_documents, returning the embedding vectors in input order.
+        Texts that could not be embedded after retries are returned as None and logged;
+        use aembed_documents_with_errors to get the error of each failed text.
+        """
+        result = await self.aembed_documents_with_errors(texts)
+        if result.errors:
+            self.logger.error("Embedding failed for %d of %d texts.", len(result.errors), len(texts))
+        return result.embeddings
+
+    async def aembed_documents_with_errors(self, texts: list) -> EmbeddingResult:
+        """Async variant of embed_documents_with_errors, keeping up to max_concurrency
+        requests in flight with Azure OpenAI's aembed_documents. Cache reads and writes run
+        in a worker thread so SQLite never blocks the event loop.
+        """
+        self.logger.info("Starting embedding process.")
+        keys, unique, vectors, batches = await asyncio.to_thread(self._prepare, texts)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def embed(batch):
+            async with semaphore:
+                return await self._aembed_batch([unique[key] for key in batch])
+
+        errors = {}
+        outcomes = await asyncio.gather(*(embed(batch) for batch in batches))
+        for batch, (embedded, error) in zip(batches, outcomes):
+            await asyncio.to_thread(self._collect, unique, batch, embedded, error, vectors, errors)
+        return self._finish(keys, vectors, errors)
+
+    def _prepare(self, texts: list):
+        """
+        Collapses duplicate texts, looks them up in the cache and splits the rest into batches of keys.
+        """
+        keys = [text_key(text) for text in texts]
+        unique = dict(zip(keys, texts))
+        vectors = self.cache.get_many(self.cache_namespace, unique) if self.cache else {}
+        missing = [key for key in unique if key not in vectors]
+        batches = [missing[start:start + self.batch_size] for start in range(0, len(missing), self.batch_size)]
+        self.logger.info(
+            "Embedding %d texts: %d distinct, %d cached, %d sent to the API in %d batches.",
+            len(texts), len(unique), len(vectors), len(missing), len(batches)
+        )
+        return keys, unique, vectors, batches
+
+    def _collect(self, unique: dict, batch: list, embedded: list, error: str, vectors: dict, errors: dict):
+        """
+        Records the vectors of a finished batch (caching them) or the error of a failed one.
+        """
+        if error is not None:
+            errors.update((key, error) for key in batch)
+            return
+        new_vectors = dict(zip(batch, embedded))
+        if self.cache:
+            self.cache.put_many(self.cache_namespace, new_vectors)
+        vectors.update(new_vectors)
+
+    def _finish(self, keys: list, vectors: dict, errors: dict) -> EmbeddingResult:
+        result = EmbeddingResult(
+            embeddings=[vectors.get(key) for key in keys],
+            errors={index: errors[key] for index, key in enumerate(keys) if key in errors}
+        )
+        if result.ok:
             self.logger.info("Embedding generated successfully.")
-            return embedding
-        except Exception as e:
-            self.logger.error("Embedding generation failed: %s",e)
-            return []
+        return result
+
+    def _embed_batch(self, texts: list):
+        """
+        Embeds one batch, retrying with backoff. Returns (vectors, None) or (None, error).
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.azure_embeddings_model.embed_documents(texts), None
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.logger.error("Embedding batch of %d texts failed: %s", len(texts), e)
+                    return None, str(e)
+                delay = self._retry_delay(attempt)
+                self.logger.info("Embedding batch failed (%s), retrying in %.1fs.", e, delay)
+                time.sleep(delay)
+
+    async def _aembed_batch(self, texts: list):
+        """
+        Async variant of _embed_batch.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self.azure_embeddings_model.aembed_documents(texts), None
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.logger.error("Embedding batch of %d texts failed: %s", len(texts), e)
+                    return None, str(e)
+                delay = self._retry_delay(attempt)
+                self.logger.info("Embedding batch failed (%s), retrying in %.1fs.", e, delay)
+                await asyncio.sleep(delay)
+
+    def _retry_delay(self, attempt: int) -> float:
+        # Exponential backoff with jitter so throttled batches do not retry in lockstep
+        return self.retry_backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
 
     def get_embedding_model(self):
         """Returns the Azure OpenAI embedding model."""
@@ -0,0 +1,139 @@
+"""
+This module provides a persistent, size-limited cache of text embeddings stored in SQLite.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from array import array
+from typing import Dict, Iterable, List
+from elsai_core.config.loggerConfig import setup_logger
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "elsai_core", "embeddings.sqlite")
+
+# SQLite limits the number of bound parameters per statement
+_QUERY_CHUNK = 500
+
+
+def text_key(text: str) -> str:
+    """
+    Returns the content hash used as the cache key of a text.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Caches embedding vectors keyed by the SHA-256 of the text, namespaced by model and
+    deployment so vectors from different models never mix. Vectors are stored as float32
+    blobs; the least recently used entries are evicted once max_entries is exceeded.
+
+    The entry count is read once when the cache is opened and then kept up to date on
+    every write, so puts never scan the table.
+
+    The database is created with owner-only permissions (directory 0700, file 0600), since
+    its keys and vectors are derived from document text. SQLite gives its WAL files the
+    same permissions.
+    """
+    def __init__(self, path: str = None, max_entries: int = 1_000_000):
+        """
+        Args:
+            path (str, optional): SQLite file. Defaults to EMBEDDING_CACHE_PATH or ~/.cache.
+            max_entries (int): Maximum cached vectors across all namespaces.
+        """
+        self.logger = setup_logger()
+        self.path = path or os.getenv("EMBEDDING_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.max_entries = max_entries
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), mode=0o700, exist_ok=True)
+            # Create the file owner-only before SQLite opens it with the default umask
+            os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, vector BLOB NOT NULL, last_used REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+            self._count = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """
+        Returns the cached vectors for the given keys; keys that are not cached are omitted.
+        """
+        keys = list(keys)
+        found = {}
+        now = time.time()
+        with self._lock, self._connection:
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[start:start + _QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE namespace = ? AND key IN ({placeholders})",
+                    [namespace, *chunk]
+                ).fetchall()
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+                if rows:
+                    self._connection.execute(
+                        f"UPDATE embeddings SET last_used = ? WHERE namespace = ? "
+                        f"AND key IN ({','.join('?' * len(rows))})",
+                        [now, namespace, *[key for key, _ in rows]]
+                    )
+        return found
+
+    def put_many(self, namespace: str, vectors: Dict[str, List[float]]):
+        """
+        Stores vectors by key and evicts the least recently used entries above max_entries.
+        """
+        if not vectors:
+            return
+        now = time.time()
+        keys = list(vectors)
+        with self._lock, self._connection:
+            existing = 0
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[start:start + _QUERY_CHUNK]
+                existing += self._connection.execute(
+                    f"SELECT COUNT(*) FROM embeddings WHERE namespace = ? AND key IN ({','.join('?' * len(chunk))})",
+                    [namespace, *chunk]
+                ).fetchone()[0]
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (namespace, key, vector, last_used) VALUES (?, ?, ?, ?)",
+                [(namespace, key, array("f", vector).tobytes(), now) for key, vector in vectors.items()]
+            )
+            self._count += len(keys) - existing
+            if self._count > self.max_entries:
+                self.logger.info("Evicting %d embeddings from the cache.", self._count - self.max_entries)
+                self._count -= self._connection.execute(
+                    "DELETE FROM embeddings WHERE rowid IN "
+                    "(SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (self._count - self.max_entries,)
+                ).rowcount
+
+    def clear(self, namespace: str = None):
+        """
+        Drops the cached vectors of one namespace, or of all namespaces.
+        """
+        with self._lock, self._connection:
+            if namespace is None:
+                self._connection.execute("DELETE FROM embeddings")
+                self._count = 0
+            else:
+                self._count -= self._connection.execute(
+                    "DELETE FROM embeddings WHERE namespace = ?", (namespace,)
+                ).rowcount
+
+    def close(self):
+        """
+        Closes the underlying SQLite connection.
+        """
+        with self._lock:
+            self._connection.close()
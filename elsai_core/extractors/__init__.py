@@ -8,6 +8,8 @@ from .docling_service import DoclingPDFTextExtractor
 from .docx_text_extractor import DocxTextExtractor
 from .pypdfloader_service import PyPDFTextExtractor
 from .visionai_pdf_extractor import VisionAIExtractor
+from .page import ExtractedPage, PageExtractor
+from .hybrid_pdf_extractor import HybridPDFExtractor
 
 __all__ = [
     AwsTextractConnector,
@@ -19,5 +21,8 @@ __all__ = [
     DoclingPDFTextExtractor,
     DocxTextExtractor,
     PyPDFTextExtractor,
-    VisionAIExtractor
+    VisionAIExtractor,
+    HybridPDFExtractor,
+    ExtractedPage,
+    PageExtractor
 ]
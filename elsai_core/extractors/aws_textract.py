@@ -1,8 +1,27 @@
 import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 import boto3
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
 from elsai_core.config.loggerConfig import setup_logger
 from langchain_community.document_loaders import AmazonTextractPDFLoader
+from langchain_core.documents import Document
 from ..connectors.aws_s3 import AwsS3Connector
+from .page import ExtractedPage
+
+# Image formats the synchronous bytes API accepts, and its payload limit
+BYTES_API_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+BYTES_API_MAX_SIZE = 10 * 1024 * 1024
+
+# Error codes worth retrying when starting or polling a job; anything else fails the file
+TRANSIENT_ERROR_CODES = {
+    "ThrottlingException", "ProvisionedThroughputExceededException", "LimitExceededException",
+    "InternalServerError", "ServiceUnavailable", "RequestTimeout"
+}
+MAX_RETRIES = 8
+MAX_BACKOFF = 60
+
 
 class AwsTextractConnector:
     """
@@ -10,15 +29,17 @@ class AwsTextractConnector:
     It handles authentication, file upload, text extraction, and cleanup in AWS S3.
     """
     def __init__(self, access_key: str = None,
-                 secret_key: str = None, session_token: str = None, region_name: str = "us-east-1"):
+                 secret_key: str = None, session_token: str = None, region_name: str = "us-east-1",
+                 endpoint_url: str = None, s3_endpoint_url: str = None):
         self.textract_client = boto3.client(
             "textract",
             aws_access_key_id=access_key,
             aws_secret_access_key=secret_key,
             aws_session_token=session_token,
-            region_name=region_name
+            region_name=region_name,
+            endpoint_url=endpoint_url
         )
-        self.s3_connector = AwsS3Connector(access_key, secret_key, session_token)
+        self.s3_connector = AwsS3Connector(access_key, secret_key, session_token, endpoint_url=s3_endpoint_url)
         self.logger = setup_logger()
         self.s3_folder = os.getenv("S3_FOLDER")
         self.s3_bucket = os.getenv("S3_BUCKET")
@@ -40,3 +61,230 @@ class AwsTextractConnector:
             raise e
         finally:
             self.s3_connector.delete_file_from_s3(self.s3_bucket, s3_key)
+
+    def extract_batch(self, file_paths: list, max_concurrent_jobs: int = 10,
+                      upload_workers: int = 8, poll_interval: float = 2.0) -> dict:
+        """
+        Extracts text from many files. Single-page images are sent directly through the
+        bytes API; all other files are uploaded to S3 concurrently and processed as
+        asynchronous Textract jobs, with at most max_concurrent_jobs running at a time.
+        Uploaded objects are removed with bulk deletes once all jobs have finished.
+
+        Args:
+            file_paths (list): Paths of the files to extract.
+            max_concurrent_jobs (int): Maximum number of Textract jobs running at once.
+            upload_workers (int): Number of threads uploading files to S3.
+            poll_interval (float): Seconds between job status polls.
+
+        Returns:
+            dict: Mapping of file path to a list of Langchain Documents, one per page.
+            Files that fail are logged and mapped to None.
+        """
+        results = {}
+        staged = []
+        for file_path in file_paths:
+            if self._use_bytes_api(file_path):
+                try:
+                    results[file_path] = self._detect_bytes(file_path)
+                except Exception as e:
+                    results[file_path] = None
+                    self.logger.error("Error extracting text from %s: %s", file_path, e)
+            else:
+                staged.append(file_path)
+
+        s3_keys = {
+            file_path: f"{self.s3_folder}/{uuid.uuid4().hex}-{os.path.basename(file_path)}"
+            for file_path in staged
+        }
+        uploaded = []
+        try:
+            with ThreadPoolExecutor(max_workers=upload_workers) as executor:
+                futures = {
+                    file_path: executor.submit(
+                        self.s3_connector.upload_file_to_s3, self.s3_bucket, s3_keys[file_path], file_path
+                    )
+                    for file_path in staged
+                }
+                for file_path, future in futures.items():
+                    try:
+                        future.result()
+                        uploaded.append(file_path)
+                    except Exception as e:
+                        results[file_path] = None
+                        self.logger.error("Error uploading %s: %s", file_path, e)
+
+            results.update(self._run_jobs(uploaded, s3_keys, max_concurrent_jobs, poll_interval))
+        finally:
+            if uploaded:
+                self.s3_connector.delete_files_from_s3(
+                    self.s3_bucket, [s3_keys[file_path] for file_path in uploaded]
+                )
+        return results
+
+    def iter_pages(self, file_path: str):
+        """
+        Uploads the file to S3 and lazily yields the pages returned by AWS Textract.
+        The S3 object is deleted once the generator is exhausted or closed.
+
+        Args:
+            file_path (str): Path to the file to extract.
+
+        Yields:
+            ExtractedPage: One record per page, in page order.
+        """
+        file_name = os.path.basename(file_path)
+        s3_key = f"{self.s3_folder}/{file_name}"
+        s3_uri = self.s3_connector.upload_file_to_s3(self.s3_bucket, s3_key, file_path)
+        try:
+            self.logger.info("Extracting pages from %s using AWS Textract", s3_uri)
+            loader = AmazonTextractPDFLoader(s3_uri, client=self.textract_client)
+            for page_number, document in enumerate(loader.lazy_load(), start=1):
+                yield ExtractedPage(
+                    page_number=document.metadata.get("page", page_number),
+                    content=document.page_content,
+                    source=file_name
+                )
+        except Exception as e:
+            self.logger.error("Error extracting text: %s", e)
+            raise e
+        finally:
+            self.s3_connector.delete_file_from_s3(self.s3_bucket, s3_key)
+
+    def _run_jobs(self, file_paths: list, s3_keys: dict, max_concurrent_jobs: int, poll_interval: float) -> dict:
+        """
+        Starts asynchronous text detection jobs up to the concurrency limit and collects
+        results as jobs complete. Starts and polls that are throttled or hit a transient
+        error are retried with exponential backoff; a file only fails on a terminal error
+        or once its retries are exhausted, and is then mapped to None.
+        """
+        queue = list(reversed(file_paths))
+        waiting = {}
+        running = {}
+        start_retries = {}
+        poll_retries = {}
+        next_poll = {}
+        results = {}
+        while queue or waiting or running:
+            now = time.monotonic()
+            for file_path in [file_path for file_path, ready_at in waiting.items() if ready_at <= now]:
+                del waiting[file_path]
+                queue.append(file_path)
+
+            while queue and len(running) < max_concurrent_jobs:
+                file_path = queue.pop()
+                try:
+                    response = self.textract_client.start_document_text_detection(
+                        DocumentLocation={"S3Object": {"Bucket": self.s3_bucket, "Name": s3_keys[file_path]}}
+                    )
+                    running[response["JobId"]] = file_path
+                    self.logger.info("Started Textract job %s for %s", response["JobId"], file_path)
+                except Exception as e:
+                    attempt = start_retries.get(file_path, 0) + 1
+                    if self._is_transient(e) and attempt <= MAX_RETRIES:
+                        start_retries[file_path] = attempt
+                        delay = self._backoff(attempt, poll_interval)
+                        waiting[file_path] = time.monotonic() + delay
+                        self.logger.warning(
+                            "Retrying start of Textract job for %s in %.1fs (attempt %d): %s",
+                            file_path, delay, attempt, e
+                        )
+                        # The remaining starts would most likely be throttled as well
+                        break
+                    results[file_path] = None
+                    self.logger.error("Error starting Textract job for %s: %s", file_path, e)
+
+            for job_id, file_path in list(running.items()):
+                if next_poll.get(job_id, 0) > time.monotonic():
+                    continue
+                try:
+                    response = self.textract_client.get_document_text_detection(JobId=job_id)
+                    if response["JobStatus"] == "IN_PROGRESS":
+                        poll_retries.pop(job_id, None)
+                        continue
+                    if response["JobStatus"] in ("SUCCEEDED", "PARTIAL_SUCCESS"):
+                        s3_uri = f"s3://{self.s3_bucket}/{s3_keys[file_path]}"
+                        results[file_path] = self._to_documents(self._collect_blocks(job_id, response), s3_uri)
+                        self.logger.info("Textract job %s for %s completed", job_id, file_path)
+                    else:
+                        results[file_path] = None
+                        self.logger.error(
+                            "Textract job %s for %s failed: %s", job_id, file_path, response.get("StatusMessage")
+                        )
+                    del running[job_id]
+                except Exception as e:
+                    attempt = poll_retries.get(job_id, 0) + 1
+                    if self._is_transient(e) and attempt <= MAX_RETRIES:
+                        poll_retries[job_id] = attempt
+                        delay = self._backoff(attempt, poll_interval)
+                        next_poll[job_id] = time.monotonic() + delay
+                        self.logger.warning(
+                            "Retrying Textract job %s for %s in %.1fs (attempt %d): %s",
+                            job_id, file_path, delay, attempt, e
+                        )
+                        continue
+                    del running[job_id]
+                    results[file_path] = None
+                    self.logger.error("Error collecting Textract job %s for %s: %s", job_id, file_path, e)
+
+            if running or waiting:
+                time.sleep(poll_interval)
+        return results
+
+    @staticmethod
+    def _backoff(attempt: int, poll_interval: float) -> float:
+        """
+        Returns the delay before retry number attempt, doubling from poll_interval up to MAX_BACKOFF.
+        """
+        return min(poll_interval * 2 ** attempt, MAX_BACKOFF)
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        """
+        Returns True for throttling, server-side and connection errors that are worth retrying.
+        """
+        if isinstance(error, ClientError):
+            return error.response.get("Error", {}).get("Code") in TRANSIENT_ERROR_CODES
+        return isinstance(error, (BotoConnectionError, HTTPClientError))
+
+    def _collect_blocks(self, job_id: str, response: dict) -> list:
+        """
+        Collects all result blocks of a finished job, following NextToken pagination.
+        """
+        blocks = list(response.get("Blocks", []))
+        while response.get("NextToken"):
+            response = self.textract_client.get_document_text_detection(
+                JobId=job_id, NextToken=response["NextToken"]
+            )
+            blocks.extend(response.get("Blocks", []))
+        return blocks
+
+    def _detect_bytes(self, file_path: str) -> list:
+        """
+        Extracts text from a single-page image with the synchronous bytes API, skipping S3.
+        """
+        self.logger.info("Extracting text from %s using the Textract bytes API", file_path)
+        with open(file_path, "rb") as f:
+            response = self.textract_client.detect_document_text(Document={"Bytes": f.read()})
+        return self._to_documents(response.get("Blocks", []), file_path)
+
+    @staticmethod
+    def _to_documents(blocks: list, source: str) -> list:
+        """
+        Groups LINE blocks by page into Langchain Documents.
+        """
+        pages = {}
+        for block in blocks:
+            if block.get("BlockType") == "LINE":
+                pages.setdefault(block.get("Page", 1), []).append(block.get("Text", ""))
+        return [
+            Document(page_content="\n".join(pages[page]), metadata={"source": source, "page": page})
+            for page in sorted(pages)
+        ]
+
+    @staticmethod
+    def _use_bytes_api(file_path: str) -> bool:
+        """
+        Checks whether a file is a single-page image small enough for the bytes API.
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        return extension in BYTES_API_EXTENSIONS and os.path.getsize(file_path) <= BYTES_API_MAX_SIZE
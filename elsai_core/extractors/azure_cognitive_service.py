@@ -5,6 +5,7 @@ from azure.cognitiveservices.vision.computervision.models import OperationStatus
 from azure.core.exceptions import AzureError
 from msrest.authentication import CognitiveServicesCredentials
 from elsai_core.config.loggerConfig import setup_logger
+from .page import ExtractedPage
 
 class AzureCognitiveService:
     """
@@ -35,35 +36,57 @@ class AzureCognitiveService:
         Returns:
             str: Extracted text from the PDF or error message if the extraction fails.
         """
-        self.logger.info("Starting text extraction from PDF: %s", self.file_path)
-
         try:
-            # Open the local file in binary mode
-            with open(self.file_path, "rb") as file_stream:
-                read_response = self.client.read_in_stream(file_stream, raw=True)
-
-            # Get the operation location (URL with an ID at the end)
-            operation_location = read_response.headers["Operation-Location"]
-            operation_id = operation_location.split("/")[-1]
-
-            # Polling the operation status
-            while True:
-                read_result = self.client.get_read_result(operation_id)
-                if read_result.status not in ['notStarted', 'running']:
-                    break
-                time.sleep(1)
-
-            # Extract text from the result if the operation was successful
-            extracted_text = ""
-            if read_result.status == OperationStatusCodes.succeeded:
-                for page_result in read_result.analyze_result.read_results:
-                    for line in page_result.lines:
-                        extracted_text += "\n" + line.text
-                    extracted_text += "\n\n"
-
+            extracted_text = "".join(
+                ("\n" + page.content if page.content else "") + "\n\n"
+                for page in self.iter_pages()
+            )
             self.logger.info("Text extraction completed successfully.")
             return extracted_text if extracted_text else "No text found in the PDF."
 
         except AzureError as e:
             self.logger.error("Error occurred during text extraction: %s", e)
             return "Error occurred: %s" % e
+
+    def iter_pages(self, file_path: str = None):
+        """
+        Runs the Read API on the PDF and yields the recognised text one page at a time.
+
+        Args:
+            file_path (str, optional): Path to the PDF. Defaults to the file given at construction.
+
+        Yields:
+            ExtractedPage: One record per page with its lines joined by newlines.
+
+        Raises:
+            AzureError: If the Read API request fails.
+        """
+        file_path = file_path or self.file_path
+        self.logger.info("Starting text extraction from PDF: %s", file_path)
+
+        # Open the local file in binary mode
+        with open(file_path, "rb") as file_stream:
+            read_response = self.client.read_in_stream(file_stream, raw=True)
+
+        # Get the operation location (URL with an ID at the end)
+        operation_location = read_response.headers["Operation-Location"]
+        operation_id = operation_location.split("/")[-1]
+
+        # Polling the operation status
+        while True:
+            read_result = self.client.get_read_result(operation_id)
+            if read_result.status not in ['notStarted', 'running']:
+                break
+            time.sleep(1)
+
+        if read_result.status != OperationStatusCodes.succeeded:
+            self.logger.warning("Read operation finished with status: %s", read_result.status)
+            return
+
+        source = os.path.basename(file_path)
+        for page_result in read_result.analyze_result.read_results:
+            yield ExtractedPage(
+                page_number=page_result.page,
+                content="\n".join(line.text for line in page_result.lines),
+                source=source
+            )
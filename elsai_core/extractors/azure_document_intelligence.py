@@ -2,6 +2,7 @@ import os
 from azure.ai.documentintelligence import DocumentIntelligenceClient
 from azure.core.credentials import AzureKeyCredential
 from elsai_core.config.loggerConfig import setup_logger
+from .page import ExtractedPage
 class AzureDocumentIntelligence:
     """
     Class to handle document analysis using Azure Document Intelligence.
@@ -33,24 +34,50 @@ class AzureDocumentIntelligence:
 
         self.logger.info("Starting text extraction from %s", self.file_path)
         try:
-
-            with open(self.file_path, "rb") as f:
-                self.logger.info("Opened file: %s", self.file_path)
-                poller = self.client.begin_analyze_document(
-                    model_id="prebuilt-layout",
-                    body=f,
-                    content_type="application/octet-stream",
-                    pages=pages
-                )
-
-            self.logger.info("Analysis started for %s. Waiting for result...", self.file_path)
-            # Get the result of the analysis
-            result = poller.result()
-            self.logger.info("Analysis completed for %s", self.file_path)
-            ocr_output = result.as_dict()
+            result = self._analyze(self.file_path, pages)
             self.logger.info("Text extraction from %s completed successfully.", self.file_path)
-            return ocr_output['content']
+            return result.content
 
         except Exception as e:
             self.logger.error("Error while extracting text from %s: %s", self.file_path, e)
             raise
+
+    def iter_pages(self, file_path: str = None, pages: str = None):
+        """
+        Analyzes the document and yields its content one page at a time, slicing the
+        page spans out of the result content instead of serializing the whole result.
+
+        Args:
+            file_path (str, optional): Path to the document. Defaults to the file given at construction.
+            pages (str, optional): Specific pages to analyze (e.g., "1,3"). Defaults to None.
+
+        Yields:
+            ExtractedPage: One record per analyzed page, in page order.
+        """
+        file_path = file_path or self.file_path
+        result = self._analyze(file_path, pages)
+        source = os.path.basename(file_path)
+        for page in result.pages or []:
+            content = "".join(
+                result.content[span.offset:span.offset + span.length] for span in page.spans or []
+            )
+            yield ExtractedPage(page_number=page.page_number, content=content, source=source)
+
+    def _analyze(self, file_path: str, pages: str = None):
+        """
+        Submits the document to the prebuilt-layout model and waits for the analysis result.
+        """
+        with open(file_path, "rb") as f:
+            self.logger.info("Opened file: %s", file_path)
+            poller = self.client.begin_analyze_document(
+                model_id="prebuilt-layout",
+                body=f,
+                content_type="application/octet-stream",
+                pages=pages
+            )
+
+        self.logger.info("Analysis started for %s. Waiting for result...", file_path)
+        # Get the result of the analysis
+        result = poller.result()
+        self.logger.info("Analysis completed for %s", file_path)
+        return result
@@ -1,6 +1,7 @@
-
+import os
 from elsai_core.config.loggerConfig import setup_logger
 from langchain_community.document_loaders.csv_loader import CSVLoader
+from .page import ExtractedPage
 class CSVFileExtractor:
     def __init__(self, file_path:str):
         self.logger = setup_logger()
@@ -27,3 +28,24 @@ class CSVFileExtractor:
         except Exception as e:
             self.logger.error("Failed to load CSV file: %s. Error: %s", self.file_path, str(e))
             raise
+
+    def iter_pages(self, file_path: str = None):
+        """
+        Lazily yields the rows of a CSV file, one record per row.
+
+        Args:
+            file_path (str, optional): Path to the CSV file. Defaults to the file given at construction.
+
+        Yields:
+            ExtractedPage: One record per CSV row, numbered from 1.
+        """
+        file_path = file_path or self.file_path
+        self.logger.info("Streaming rows from CSV file: %s", file_path)
+        loader = CSVLoader(file_path)
+        source = os.path.basename(file_path)
+        for document in loader.lazy_load():
+            yield ExtractedPage(
+                page_number=document.metadata.get("row", 0) + 1,
+                content=document.page_content,
+                source=source
+            )
@@ -1,10 +1,63 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from elsai_core.config.loggerConfig import setup_logger
+from docling.datamodel.base_models import ConversionStatus
 from docling.document_converter import DocumentConverter
+from .page import ExtractedPage
+
+_converter = None
+_converter_lock = threading.Lock()
+
+
+def get_converter() -> DocumentConverter:
+    """
+    Returns the process-wide docling DocumentConverter, creating it on first use so the
+    layout and table models are loaded once per process.
+    """
+    global _converter
+    if _converter is None:
+        with _converter_lock:
+            if _converter is None:
+                _converter = DocumentConverter()
+    return _converter
+
+
+def _warm_up_worker():
+    """
+    Worker initializer that loads the docling models once per worker process.
+    """
+    get_converter()
+
+
+def _convert_batch(file_paths: list) -> dict:
+    """
+    Converts a batch of files to markdown with the process-wide converter.
+    Runs in the calling process or inside a worker process.
+
+    Each result is matched to its input through result.input.file rather than by position,
+    so a skipped or reordered conversion never shifts content onto another file. Files
+    without a successful result map to None.
+    """
+    results = dict.fromkeys(file_paths)
+    inputs = {}
+    for file_path in file_paths:
+        inputs.setdefault(os.path.abspath(file_path), []).append(file_path)
+    for result in get_converter().convert_all(file_paths, raises_on_error=False):
+        if result.status not in (ConversionStatus.SUCCESS, ConversionStatus.PARTIAL_SUCCESS):
+            continue
+        matches = inputs.get(os.path.abspath(str(result.input.file)), [])
+        if matches:
+            markdown = result.document.export_to_markdown()
+            for file_path in matches:
+                results[file_path] = markdown
+    return results
+
 
 class DoclingPDFTextExtractor:
     """
-    A class to extract text from PDF files using AWS Textract after uploading to S3.
-    It handles authentication, file upload, text extraction, and cleanup in AWS S3.
+    A class to extract text from PDF files using docling. The docling converter is
+    shared per process so models are only loaded once.
     """
 
     def __init__(self, file_path:str):
@@ -15,15 +68,14 @@ class DoclingPDFTextExtractor:
         """
         Extracts text from a PDF file using docling.
 
-        
+
 
         Returns:
             str: Extracted text content from the PDF file.
         """
         try:
             self.logger.info("Starting PDF extraction from %s", self.file_path)
-            converter = DocumentConverter()
-            result = converter.convert(self.file_path)
+            result = get_converter().convert(self.file_path)
             extracted_text = result.document.export_to_markdown()
             return extracted_text
 
@@ -33,3 +85,60 @@ class DoclingPDFTextExtractor:
         except Exception as e:
             self.logger.error("Error while extracting text from %s: %s", self.file_path, e)
             return "Error occurred: %s" % e
+
+    @staticmethod
+    def extract_batch(file_paths: list, max_workers: int = None, batch_size: int = 8) -> dict:
+        """
+        Converts many PDFs to markdown using docling's multi-document conversion.
+
+        With max_workers unset, all files are converted in this process with the shared
+        converter. Otherwise they are split into batches and converted in a process pool
+        whose workers each load the docling models once at start-up.
+
+        Args:
+            file_paths (list): Paths of the PDF files to convert.
+            max_workers (int, optional): Number of worker processes. Defaults to None (in-process).
+            batch_size (int): Number of files handed to a worker per task.
+
+        Returns:
+            dict: Mapping of file path to its markdown, or None if the conversion failed.
+        """
+        logger = setup_logger()
+        file_paths = [str(file_path) for file_path in file_paths]
+        if not max_workers:
+            logger.info("Converting %d files in-process with docling", len(file_paths))
+            results = _convert_batch(file_paths)
+        else:
+            batches = [file_paths[i:i + batch_size] for i in range(0, len(file_paths), batch_size)]
+            logger.info(
+                "Converting %d files in %d batches over %d workers", len(file_paths), len(batches), max_workers
+            )
+            results = {}
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_warm_up_worker) as executor:
+                for batch_results in executor.map(_convert_batch, batches):
+                    results.update(batch_results)
+        failed = [file_path for file_path, markdown in results.items() if markdown is None]
+        if failed:
+            logger.error("docling failed to convert %d files: %s", len(failed), failed)
+        return results
+
+    def iter_pages(self, file_path: str = None):
+        """
+        Converts the PDF with docling and yields the markdown of each page in order.
+
+        Args:
+            file_path (str, optional): Path to the PDF file. Defaults to the file given at construction.
+
+        Yields:
+            ExtractedPage: One record per page with its markdown content.
+        """
+        file_path = file_path or self.file_path
+        self.logger.info("Starting PDF extraction from %s", file_path)
+        document = get_converter().convert(file_path).document
+        source = os.path.basename(file_path)
+        for page_no in sorted(document.pages):
+            yield ExtractedPage(
+                page_number=page_no,
+                content=document.export_to_markdown(page_no=page_no),
+                source=source
+            )
@@ -1,5 +1,7 @@
+import os
 from elsai_core.config.loggerConfig import setup_logger
 from langchain_community.document_loaders import Docx2txtLoader
+from .page import ExtractedPage
 
 class DocxTextExtractor:
     """
@@ -37,3 +39,21 @@ class DocxTextExtractor:
                 "Unexpected error while extracting text from %s: %s", self.file_path, e
                 )
             return f"An unexpected error occurred: {e}"
+
+    def iter_pages(self, file_path: str = None):
+        """
+        Yields the text of a DOCX file. DOCX files carry no page layout, so the
+        whole document is yielded as a single page.
+
+        Args:
+            file_path (str, optional): Path to the DOCX file. Defaults to the file given at construction.
+
+        Yields:
+            ExtractedPage: A single record with the document text.
+        """
+        file_path = file_path or self.file_path
+        self.logger.info("Starting docx extraction from %s", file_path)
+        loader = Docx2txtLoader(file_path)
+        source = os.path.basename(file_path)
+        for page_number, document in enumerate(loader.lazy_load(), start=1):
+            yield ExtractedPage(page_number=page_number, content=document.page_content, source=source)
@@ -0,0 +1,184 @@
+"""
+This module provides per-page routing between the local PDF text layer and cloud OCR.
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pypdf import PdfReader
+from elsai_core.config.loggerConfig import setup_logger
+from .page import ExtractedPage
+
+LOCAL = "local"
+OCR = "ocr"
+
+# A whitespace-delimited amount or quantity, e.g. "2", "1,250.00", "$45.50" or "10%"
+_NUMBER = re.compile(r"(?<!\S)[$€£]?-?\d[\d,]*(?:\.\d+)?%?(?!\S)")
+
+
+def format_page_ranges(page_numbers: list) -> str:
+    """
+    Formats page numbers as a compact page selection string (e.g. [1, 2, 3, 7] -> "1-3,7").
+
+    Args:
+        page_numbers (list): 1-based page numbers.
+
+    Returns:
+        str: Page selection accepted by the Document Intelligence `pages` parameter.
+    """
+    ranges = []
+    for page_number in sorted(set(page_numbers)):
+        if ranges and page_number == ranges[-1][1] + 1:
+            ranges[-1][1] = page_number
+        else:
+            ranges.append([page_number, page_number])
+    return ",".join(str(start) if start == end else f"{start}-{end}" for start, end in ranges)
+
+
+def looks_like_table(text: str, min_rows: int = 3, min_numbers_per_row: int = 2) -> bool:
+    """
+    Checks whether page text looks like it holds a table, such as invoice line items: at
+    least min_rows lines carrying min_numbers_per_row or more amounts or quantities.
+
+    Args:
+        text (str): Text layer of the page.
+        min_rows (int): Minimum number of numeric rows.
+        min_numbers_per_row (int): Minimum numbers on a line for it to count as a row.
+
+    Returns:
+        bool: True when the page should also go through table extraction.
+    """
+    rows = sum(1 for line in text.splitlines() if len(_NUMBER.findall(line)) >= min_numbers_per_row)
+    return rows >= min_rows
+
+
+class HybridPDFExtractor:
+    """
+    Extracts PDFs page by page, reading digitally generated pages from their local text
+    layer with pypdf and sending only scanned or low-quality pages to cloud OCR.
+    """
+    def __init__(
+            self,
+            file_path: str,
+            ocr_extractor=None,
+            min_text_chars: int = 200,
+            min_text_chars_with_images: int = 800,
+            min_text_quality: float = 0.85
+    ):
+        """
+        Args:
+            file_path (str): Path to the PDF file.
+            ocr_extractor (optional): Extractor whose iter_pages(file_path, pages=...) handles OCR pages.
+                Defaults to AzureDocumentIntelligence, created only when a page needs OCR.
+            min_text_chars (int): Minimum non-whitespace characters for a page to be read locally.
+            min_text_chars_with_images (int): Minimum characters for pages that also contain images,
+                since scanned pages often carry a thin text layer (stamps, headers) over the image.
+            min_text_quality (float): Minimum share of readable characters in the text layer.
+        """
+        self.logger = setup_logger()
+        self.file_path = file_path
+        self.ocr_extractor = ocr_extractor
+        self.min_text_chars = min_text_chars
+        self.min_text_chars_with_images = min_text_chars_with_images
+        self.min_text_quality = min_text_quality
+
+    def route_pages(self, file_path: str = None):
+        """
+        Inspects every page locally and decides whether it can be read from the text layer.
+
+        Args:
+            file_path (str, optional): Path to the PDF. Defaults to the file given at construction.
+
+        Returns:
+            tuple: (local_pages, ocr_pages) where local_pages maps page numbers to their
+            text layer and ocr_pages lists the page numbers that need OCR.
+        """
+        file_path = file_path or self.file_path
+        reader = PdfReader(file_path)
+        local_pages = {}
+        ocr_pages = []
+        for page_number, page in enumerate(reader.pages, start=1):
+            text = page.extract_text() or ""
+            if self._route(text, self._has_images(page)) == LOCAL:
+                local_pages[page_number] = text
+            else:
+                ocr_pages.append(page_number)
+        self.logger.info(
+            "Routed %s: %d pages from text layer, %d pages to OCR",
+            os.path.basename(file_path), len(local_pages), len(ocr_pages)
+        )
+        return local_pages, ocr_pages
+
+    def iter_pages(self, file_path: str = None):
+        """
+        Yields all pages in page order, merging local text-layer pages with OCR results.
+        OCR runs in the background for the selected pages only, while leading local pages
+        are yielded immediately.
+
+        Args:
+            file_path (str, optional): Path to the PDF. Defaults to the file given at construction.
+
+        Yields:
+            ExtractedPage: One record per page with metadata["extraction"] set to "local" or "ocr".
+        """
+        file_path = file_path or self.file_path
+        source = os.path.basename(file_path)
+        local_pages, ocr_pages = self.route_pages(file_path)
+        page_count = len(local_pages) + len(ocr_pages)
+
+        if not ocr_pages:
+            for page_number in range(1, page_count + 1):
+                yield ExtractedPage(page_number, local_pages[page_number], source, {"extraction": LOCAL})
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self._run_ocr, file_path, ocr_pages)
+            ocr_results = None
+            for page_number in range(1, page_count + 1):
+                if page_number in local_pages:
+                    yield ExtractedPage(page_number, local_pages.pop(page_number), source, {"extraction": LOCAL})
+                    continue
+                if ocr_results is None:
+                    ocr_results = future.result()
+                yield ExtractedPage(page_number, ocr_results.pop(page_number, ""), source, {"extraction": OCR})
+
+    def _run_ocr(self, file_path: str, page_numbers: list) -> dict:
+        """
+        Submits only the given pages to the OCR extractor and returns their content by page number.
+        """
+        if self.ocr_extractor is None:
+            from .azure_document_intelligence import AzureDocumentIntelligence
+            self.ocr_extractor = AzureDocumentIntelligence(file_path)
+        pages = format_page_ranges(page_numbers)
+        self.logger.info("Submitting pages %s of %s to OCR", pages, file_path)
+        return {
+            page.page_number: page.content
+            for page in self.ocr_extractor.iter_pages(file_path, pages=pages)
+        }
+
+    def _route(self, text: str, has_images: bool) -> str:
+        """
+        Decides the route for a single page from its text layer and image presence.
+        """
+        visible_chars = [char for char in text if not char.isspace()]
+        if not visible_chars:
+            return OCR
+        readable = sum(1 for char in visible_chars if char.isalnum() or char in ".,:;$%/-()#&@'\"*+")
+        if readable / len(visible_chars) < self.min_text_quality:
+            return OCR
+        min_chars = self.min_text_chars_with_images if has_images else self.min_text_chars
+        return LOCAL if len(visible_chars) >= min_chars else OCR
+
+    @staticmethod
+    def _has_images(page) -> bool:
+        """
+        Checks the page resources for image XObjects without decoding them.
+        """
+        resources = page.get("/Resources")
+        if resources is None:
+            return False
+        x_objects = resources.get_object().get("/XObject")
+        if x_objects is None:
+            return False
+        x_objects = x_objects.get_object()
+        return any(x_objects[name].get_object().get("/Subtype") == "/Image" for name in x_objects)
@@ -1,4 +1,6 @@
+import os
 from llama_parse import LlamaParse
+from .page import ExtractedPage
 
 class LlamaParseExtractor:
     """
@@ -20,3 +22,17 @@ class LlamaParseExtractor:
             Any: Parsed data returned by LlamaParse.
         """
         return self.llama_parse.load_data(csv_file_path)
+
+    def iter_pages(self, file_path: str):
+        """
+        Parses a file using LlamaParse and yields the parsed documents one at a time.
+
+        Args:
+            file_path (str): Path to the file.
+
+        Yields:
+            ExtractedPage: One record per document returned by LlamaParse.
+        """
+        source = os.path.basename(file_path)
+        for page_number, document in enumerate(self.llama_parse.load_data(file_path), start=1):
+            yield ExtractedPage(page_number=page_number, content=document.text, source=source)
@@ -0,0 +1,48 @@
+"""
+This module defines the common page-streaming interface shared by all extractors.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Protocol, runtime_checkable
+from langchain_core.documents import Document
+
+
+@dataclass(frozen=True)
+class ExtractedPage:
+    """
+    A lightweight record holding the content of a single extracted page.
+
+    Attributes:
+        page_number (int): 1-based page (or record/sheet) number within the source.
+        content (str): Text content of the page.
+        source (str): Base name of the file the page was extracted from.
+        metadata (dict): Extractor specific metadata for the page.
+    """
+    page_number: int
+    content: str
+    source: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def to_document(self) -> Document:
+        """
+        Converts the page into a Langchain Document with page number and source metadata.
+        """
+        return Document(
+            page_content=self.content,
+            metadata={**self.metadata, "page_number": self.page_number, "source": self.source}
+        )
+
+
+@runtime_checkable
+class PageExtractor(Protocol):
+    """
+    Protocol implemented by every extractor in elsai_core.extractors.
+
+    iter_pages yields pages lazily so downstream chunking and embedding can start
+    on the first page while later pages are still being extracted.
+    """
+
+    def iter_pages(self, file_path: Optional[str] = None) -> Iterator[ExtractedPage]:
+        """
+        Yields the pages of the given file (or the file the extractor was built with) in order.
+        """
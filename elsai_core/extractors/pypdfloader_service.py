@@ -1,10 +1,33 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
 from langchain_community.document_loaders import PyPDFLoader
+from pypdf import PdfReader
 from elsai_core.config.loggerConfig import setup_logger
+from .page import ExtractedPage
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> list:
+    """
+    Extracts the text layer of pages [start, stop) of a PDF. Runs inside worker processes.
+    """
+    reader = PdfReader(file_path)
+    return [reader.pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+def _page_ranges(page_count: int, pages_per_task: int) -> list:
+    """
+    Splits a page count into [start, stop) ranges of at most pages_per_task pages.
+    """
+    return [
+        (start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ]
+
 
 class PyPDFTextExtractor:
     """
     A class to extract text content from PDF files using the PyPDFLoader library.
-    This class handles the initialization of a logger, 
+    This class handles the initialization of a logger,
     loading the PDF file, and extracting its text content.
     """
     def __init__(self, file_path:str):
@@ -13,16 +36,14 @@ class PyPDFTextExtractor:
 
     def extract_text_from_pdf(self)->str:
         """
-            Extracts text from the PDF file.
+            Extracts text from every page of the PDF file.
 
             Returns:
-                str: The extracted text or an error message.
+                str: The extracted text of all pages separated by blank lines, or an error message.
         """
         try:
             self.logger.info("Starting PDF extraction from %s", self.file_path)
-            loader = PyPDFLoader(self.file_path)
-            docs = loader.load()
-            extracted_contents = docs[0].page_content
+            extracted_contents = "\n\n".join(page for page in self.extract_pages() if page)
             return extracted_contents if extracted_contents else "No text contents found in the PDF"
 
         except FileNotFoundError as e:
@@ -32,3 +53,100 @@ class PyPDFTextExtractor:
         except Exception as e:
             self.logger.error("Error while extracting text from %s: %s", self.file_path, e)
             return f"Error occurred: {e}"
+
+    def extract_pages(
+            self,
+            max_workers: int = None,
+            pages_per_task: int = 16,
+            parallel_threshold: int = 64
+    ) -> list:
+        """
+        Extracts the text layer of every page. Documents with more than parallel_threshold
+        pages are split into page ranges that are extracted in a process pool.
+
+        Args:
+            max_workers (int, optional): Number of worker processes. Defaults to the CPU count.
+            pages_per_task (int): Number of pages extracted per worker task.
+            parallel_threshold (int): Minimum page count before a process pool is used.
+
+        Returns:
+            list: Text of each page, in page order.
+        """
+        page_count = len(PdfReader(self.file_path).pages)
+        if page_count <= parallel_threshold:
+            return _extract_page_range(self.file_path, 0, page_count)
+
+        self.logger.info("Extracting %d pages of %s in a process pool", page_count, self.file_path)
+        ranges = _page_ranges(page_count, pages_per_task)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            chunks = executor.map(
+                _extract_page_range,
+                [self.file_path] * len(ranges),
+                [start for start, _ in ranges],
+                [stop for _, stop in ranges]
+            )
+            return [page for chunk in chunks for page in chunk]
+
+    @staticmethod
+    def extract_batch(file_paths: list, max_workers: int = None, pages_per_task: int = 16) -> dict:
+        """
+        Extracts the text layer of many PDFs in one shared process pool. Files are split into
+        page ranges so large documents do not leave workers idle while small ones finish.
+
+        Args:
+            file_paths (list): Paths of the PDF files to extract.
+            max_workers (int, optional): Number of worker processes. Defaults to the CPU count.
+            pages_per_task (int): Number of pages extracted per worker task.
+
+        Returns:
+            dict: Mapping of file path to the list of its page texts. Files that fail to
+            open or extract are logged and left out of the result.
+        """
+        logger = setup_logger()
+        tasks = []
+        for file_path in file_paths:
+            try:
+                page_count = len(PdfReader(file_path).pages)
+            except Exception as e:
+                logger.error("Error while reading %s: %s", file_path, e)
+                continue
+            tasks.extend((file_path, start, stop) for start, stop in _page_ranges(page_count, pages_per_task))
+
+        logger.info("Extracting %d files as %d page-range tasks", len(file_paths), len(tasks))
+        results = {}
+        failed = set()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [(task, executor.submit(_extract_page_range, *task)) for task in tasks]
+            for (file_path, start, _), future in futures:
+                try:
+                    results.setdefault(file_path, {})[start] = future.result()
+                except Exception as e:
+                    logger.error("Error while extracting text from %s: %s", file_path, e)
+                    failed.add(file_path)
+
+        return {
+            file_path: [page for start in sorted(chunks) for page in chunks[start]]
+            for file_path, chunks in results.items()
+            if file_path not in failed
+        }
+
+    def iter_pages(self, file_path: str = None):
+        """
+        Lazily yields the text layer of each PDF page.
+
+        Args:
+            file_path (str, optional): Path to the PDF file. Defaults to the file given at construction.
+
+        Yields:
+            ExtractedPage: One record per page, in page order.
+        """
+        file_path = file_path or self.file_path
+        self.logger.info("Streaming PDF pages from %s", file_path)
+        loader = PyPDFLoader(file_path)
+        source = os.path.basename(file_path)
+        for document in loader.lazy_load():
+            yield ExtractedPage(
+                page_number=document.metadata.get("page", 0) + 1,
+                content=document.page_content,
+                source=source
+            )
@@ -1,5 +1,8 @@
+import os
+from itertools import groupby
 from langchain_community.document_loaders import UnstructuredExcelLoader
 from elsai_core.config.loggerConfig import setup_logger
+from .page import ExtractedPage
 
 class UnstructuredExcelLoaderService:
     """
@@ -33,3 +36,29 @@ class UnstructuredExcelLoaderService:
         except Exception as e:
             self.logger.error("An error occurred while loading the Excel file: %s", e)
             return None
+
+    def iter_pages(self, file_path: str = None):
+        """
+        Lazily yields the sheets of an Excel file. Elements are streamed from the
+        loader and grouped by sheet, so only one sheet is held in memory at a time.
+
+        Args:
+            file_path (str, optional): Path to the Excel file. Defaults to the file given at construction.
+
+        Yields:
+            ExtractedPage: One record per sheet with the sheet name in its metadata.
+        """
+        file_path = file_path or self.file_path
+        self.logger.info("Streaming %s Excel File...", file_path)
+        loader = UnstructuredExcelLoader(file_path, mode="elements")
+        source = os.path.basename(file_path)
+        for page_number, elements in groupby(
+            loader.lazy_load(), key=lambda doc: doc.metadata.get("page_number", 1)
+        ):
+            elements = list(elements)
+            yield ExtractedPage(
+                page_number=page_number,
+                content="\n".join(element.page_content for element in elements),
+                source=source,
+                metadata={"page_name": elements[0].metadata.get("page_name")}
+            )
@@ -1,22 +1,124 @@
 import os
 import base64
+import hashlib
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from openai import OpenAI
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
+from PIL import Image
 from langchain_core.documents import Document
 from elsai_core.config.loggerConfig import setup_logger
+from .page import ExtractedPage
 
+IMAGE_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+# Pages with a smaller fraction of ink pixels are treated as blank
+BLANK_INK_FRACTION = 0.00002
 
 
+def prepare_image(page_image, max_long_edge=1600, grayscale=True):
+    """
+    Downscales a page image so its long edge is at most max_long_edge pixels and
+    optionally converts it to grayscale.
+    """
+    image = page_image.convert("L") if grayscale else page_image.convert("RGB")
+    long_edge = max(image.size)
+    if max_long_edge and long_edge > max_long_edge:
+        scale = max_long_edge / long_edge
+        image = image.resize(
+            (max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+            Image.LANCZOS
+        )
+    return image
+
+
+def image_digest(image) -> str:
+    """
+    Computes a SHA-256 digest of an image's mode, size and pixels. Only pixel-identical
+    pages share a digest, so pages that differ in a single amount or date never do.
+    """
+    digest = hashlib.sha256(f"{image.mode}:{image.width}x{image.height}:".encode("utf-8"))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def ink_fraction(image, max_long_edge=1024, contrast=64) -> float:
+    """
+    Returns the fraction of pixels that differ from the page background by more than
+    contrast gray levels, measured on a copy downscaled to max_long_edge pixels.
+    """
+    gray = image.convert("L")
+    if max(gray.size) > max_long_edge:
+        scale = max_long_edge / max(gray.size)
+        gray = gray.resize((max(1, round(gray.width * scale)), max(1, round(gray.height * scale))))
+    histogram = gray.histogram()
+    total = sum(histogram)
+    # The most common gray level is the paper
+    background = max(range(256), key=histogram.__getitem__)
+    ink = sum(count for level, count in enumerate(histogram) if abs(level - background) > contrast)
+    return ink / total if total else 0.0
+
+
+def is_blank(image, threshold=BLANK_INK_FRACTION) -> bool:
+    """
+    Checks whether a page is blank: fewer than threshold (by default 0.002%) of its pixels
+    stand out from the background. A single short line of text is well above that.
+    """
+    return ink_fraction(image) < threshold
+
 
 class VisionAIExtractor:
     """
     VisionAIPDFExtractor is a class that interacts with OpenAI Vision AI client
     to extract text from PDFs.
     """
-    def __init__(self, api_key, model_name="gpt-4o"):
+    def __init__(
+            self,
+            api_key,
+            model_name="gpt-4o",
+            dpi=150,
+            render_window=4,
+            max_in_flight=4,
+            max_long_edge=1600,
+            grayscale=True,
+            image_format="JPEG",
+            image_quality=80,
+            skip_blank_pages=True,
+            blank_threshold=BLANK_INK_FRACTION,
+            page_cache=None
+    ):
+        """
+        Args:
+            api_key: The OpenAI API key.
+            model_name: The vision model to use. Defaults to "gpt-4o".
+            dpi: Resolution used to rasterize PDF pages. Defaults to 150.
+            render_window: Number of pages rasterized per pdf2image call. Defaults to 4.
+            max_in_flight: Maximum number of concurrent page requests to the model. Defaults to 4.
+            max_long_edge: Long edge in pixels pages are downscaled to before upload. Defaults to 1600.
+            grayscale: Convert pages to grayscale before upload. Defaults to True.
+            image_format: Upload format, one of "JPEG", "WEBP" or "PNG". Defaults to "JPEG".
+            image_quality: Encoder quality for JPEG/WEBP. Defaults to 80.
+            skip_blank_pages: Return empty content for blank pages without calling the model.
+            blank_threshold: Fraction of ink pixels below which a page counts as blank. Defaults to 0.00002.
+            page_cache: Mapping used to cache page results by the exact digest of the prepared
+                page image, e.g. a dict or a shelve.Shelf for persistence across runs. Defaults
+                to an in-memory dict.
+        """
+        if image_format.upper() not in IMAGE_MIME_TYPES:
+            raise ValueError(f"Unsupported image format: {image_format}")
         self.api_key = api_key
         self.model_name = model_name
+        self.dpi = dpi
+        self.render_window = max(1, render_window)
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_long_edge = max_long_edge
+        self.grayscale = grayscale
+        self.image_format = image_format.upper()
+        self.image_quality = image_quality
+        self.skip_blank_pages = skip_blank_pages
+        self.blank_threshold = blank_threshold
+        self.page_cache = {} if page_cache is None else page_cache
         self.client = OpenAI(api_key=api_key)
         self.logger = setup_logger()
 
@@ -31,16 +133,79 @@ class VisionAIExtractor:
         Returns:
             str: List of Langchain Documents containing the extracted text from each page.
         """
-        images = convert_from_path(pdf_path)
-        documents = []
-        for page_num, page_image in enumerate(images, start=1):
-            documents.append(self.__get_image_as_document(page_num, page_image, pdf_path))
-        return documents
+        return [
+            Document(
+                page_content=page.content,
+                metadata={"page_num": page.page_number, "source": page.source}
+            )
+            for page in self.iter_pages(pdf_path)
+        ]
+
+    def iter_pages(self, file_path: str):
+        """
+        Renders the PDF in small windows of pages into a temporary directory and sends
+        the pages to the Vision AI client concurrently, with at most max_in_flight
+        requests outstanding. Results are yielded in page order as they become available.
+
+        Args:
+            file_path: The path to the PDF file.
+
+        Yields:
+            ExtractedPage: One record per page, in page order.
+        """
+        page_count = pdfinfo_from_path(file_path)["Pages"]
+        source = os.path.basename(file_path)
+        pending = deque()
+        with tempfile.TemporaryDirectory() as output_folder, \
+                ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            for first_page in range(1, page_count + 1, self.render_window):
+                last_page = min(first_page + self.render_window - 1, page_count)
+                images = convert_from_path(
+                    file_path,
+                    dpi=self.dpi,
+                    first_page=first_page,
+                    last_page=last_page,
+                    output_folder=output_folder
+                )
+                for page_num, page_image in enumerate(images, start=first_page):
+                    pending.append(
+                        (page_num, executor.submit(self.__process_page, page_num, page_image, file_path))
+                    )
+                # Bound the number of rendered pages waiting on the model
+                while len(pending) > self.max_in_flight:
+                    page_num, future = pending.popleft()
+                    yield ExtractedPage(page_number=page_num, content=future.result(), source=source)
+
+            while pending:
+                page_num, future = pending.popleft()
+                yield ExtractedPage(page_number=page_num, content=future.result(), source=source)
 
-    def __get_image_as_document(self, page_num, page_image, file_path):
+    def __process_page(self, page_num, page_image, file_path):
+        try:
+            image = prepare_image(page_image, self.max_long_edge, self.grayscale)
+            if self.skip_blank_pages:
+                ink = ink_fraction(image)
+                if ink < self.blank_threshold:
+                    self.logger.info("Skipping blank page %d of %s (%.4f%% ink)", page_num, file_path, ink * 100)
+                    return ""
+            cache_key = f"{self.model_name}:{image_digest(image)}"
+            cached = self.page_cache.get(cache_key)
+            if cached is not None:
+                self.logger.info("Using cached result for page %d of %s", page_num, file_path)
+                return cached
+            page_content = self.__get_image_as_markdown(page_num, image, file_path)
+            self.page_cache[cache_key] = page_content
+            return page_content
+        finally:
+            page_image.close()
+            if getattr(page_image, "filename", None):
+                os.remove(page_image.filename)
+
+    def __get_image_as_markdown(self, page_num, page_image, file_path):
         buffer = BytesIO()
         try :
-            page_image.save(buffer, format="PNG")
+            save_options = {} if self.image_format == "PNG" else {"quality": self.image_quality}
+            page_image.save(buffer, format=self.image_format, **save_options)
             image_bytes = buffer.getvalue()
             base64_image = base64.b64encode(image_bytes).decode("utf-8")
 
@@ -67,7 +232,7 @@ class VisionAIExtractor:
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": f"data:image/png;base64,{base64_image}"
+                                    "url": f"data:{IMAGE_MIME_TYPES[self.image_format]};base64,{base64_image}"
                                 },
                             },
                         ],
@@ -75,14 +240,7 @@ class VisionAIExtractor:
                 ],
                 temperature=0.0,
             )
-            page_content = response.choices[0].message.content.strip()
-            return Document(
-                page_content=page_content,
-                metadata={
-                    "page_num": page_num,
-                    "source": os.path.basename(file_path),
-                }
-            )
+            return response.choices[0].message.content.strip()
         except Exception as e:
             self.logger.error("Error while processing page %d of %s: %s", page_num, file_path, e)
             raise e
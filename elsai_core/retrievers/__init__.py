@@ -1,5 +1,11 @@
 from .hybrid_retriever import HybridRetriever
+from .bm25_index import BM25Index, get_bm25_index
+from .sparse_bm25 import SparseBM25, SparseBM25Retriever
 
 __all__ = [
-    "HybridRetriever"
+    "HybridRetriever",
+    "BM25Index",
+    "get_bm25_index",
+    "SparseBM25",
+    "SparseBM25Retriever"
 ]
@@ -0,0 +1,270 @@
+"""
+This module provides a persistent BM25 index that is updated incrementally and shared per collection.
+"""
+
+import os
+import re
+import json
+import math
+import heapq
+import hashlib
+import threading
+from collections import Counter
+from typing import AbstractSet, FrozenSet, Iterable, List, Optional, Tuple
+from pydantic import ConfigDict
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from ..config.loggerConfig import setup_logger
+
+DEFAULT_INDEX_DIR = os.path.join(os.path.expanduser("~"), ".cache", "elsai_core", "bm25")
+
+_TOKEN = re.compile(r"\w+")
+_SAFE_NAME = re.compile(r"[A-Za-z0-9_-]+")
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into lowercase word tokens.
+    """
+    return _TOKEN.findall(text.lower())
+
+
+def chunk_id(text: str) -> str:
+    """
+    Returns the content hash that identifies a chunk in the index.
+    """
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class BM25Index:
+    """
+    An Okapi BM25 index over text chunks backed by an inverted index.
+
+    Chunks can be added and removed without rebuilding, and a query only visits the
+    postings of its own terms. The index can be saved to and loaded from a JSON file.
+
+    The saved file holds the full text of every chunk in plaintext. It is written with
+    owner-only permissions, but the directory should only be one the data may live in.
+    """
+    def __init__(self, path: Optional[str] = None, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            path (str, optional): JSON file the index is persisted to. None keeps it in memory only.
+            k1 (float): Term frequency saturation.
+            b (float): Document length normalization.
+        """
+        self.logger = setup_logger()
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._texts = {}
+        self._term_frequencies = {}
+        self._lengths = {}
+        self._postings = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+        if path and os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, text: str) -> bool:
+        return chunk_id(text) in self._texts
+
+    def add_chunks(self, chunks: Iterable[str]) -> int:
+        """
+        Adds chunks that are not in the index yet.
+
+        Returns:
+            int: Number of chunks added.
+        """
+        added = 0
+        with self._lock:
+            for text in chunks:
+                doc_id = chunk_id(text)
+                if doc_id in self._texts:
+                    continue
+                self._insert(doc_id, text, Counter(tokenize(text)))
+                added += 1
+        return added
+
+    def remove_chunks(self, chunks: Iterable[str]) -> int:
+        """
+        Removes chunks from the index.
+
+        Returns:
+            int: Number of chunks removed.
+        """
+        return self._remove_ids([chunk_id(text) for text in chunks])
+
+    def sync(self, chunks: Iterable[str]) -> Tuple[int, int]:
+        """
+        Makes the index hold exactly the given chunks, touching only the chunks that changed.
+
+        Returns:
+            Tuple[int, int]: Number of chunks added and removed.
+        """
+        chunks = list(chunks)
+        with self._lock:
+            wanted = {chunk_id(text) for text in chunks}
+            removed = self._remove_ids([doc_id for doc_id in self._texts if doc_id not in wanted])
+            added = self.add_chunks(chunks)
+        return added, removed
+
+    def search(self, query: str, k: int = 4, allowed_ids: Optional[AbstractSet[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Returns the k best matching chunks with their BM25 scores, best first.
+
+        Args:
+            query (str): The query text.
+            k (int): Number of chunks returned.
+            allowed_ids (set, optional): Chunk ids (see chunk_id) the results are limited to.
+                Term statistics still cover the whole index.
+        """
+        with self._lock:
+            count = len(self._texts)
+            if not count:
+                return []
+            average_length = self._total_length / count
+            scores = {}
+            # Repeated query terms count repeatedly, as in rank-bm25
+            for term, query_count in Counter(tokenize(query)).items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = query_count * math.log(1 + (count - df + 0.5) / (df + 0.5))
+                for doc_id, frequency in postings.items():
+                    if allowed_ids is not None and doc_id not in allowed_ids:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [(self._texts[doc_id], score) for doc_id, score in best]
+
+    def as_retriever(self, k: int = 4, chunks: Optional[Iterable[str]] = None) -> "BM25IndexRetriever":
+        """
+        Returns a Langchain retriever over this index, usable in an EnsembleRetriever.
+        With chunks, the retriever only returns those chunks.
+        """
+        allowed_ids = frozenset(chunk_id(text) for text in chunks) if chunks is not None else None
+        return BM25IndexRetriever(index=self, k=k, allowed_ids=allowed_ids)
+
+    def save(self):
+        """
+        Writes the index to its path atomically.
+        """
+        if not self.path:
+            return
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), mode=0o700, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            # Owner-only permissions: the file contains the chunk texts
+            with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f:
+                json.dump({
+                    "k1": self.k1,
+                    "b": self.b,
+                    "chunks": {
+                        doc_id: [text, self._term_frequencies[doc_id]] for doc_id, text in self._texts.items()
+                    }
+                }, f)
+            os.replace(tmp_path, self.path)
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.error("Ignoring unreadable BM25 index %s: %s", self.path, e)
+            return
+        self.k1, self.b = stored.get("k1", self.k1), stored.get("b", self.b)
+        for doc_id, (text, frequencies) in stored["chunks"].items():
+            self._insert(doc_id, text, frequencies)
+        self.logger.info("Loaded BM25 index %s with %d chunks.", self.path, len(self._texts))
+
+    def _insert(self, doc_id: str, text: str, frequencies: dict):
+        self._texts[doc_id] = text
+        self._term_frequencies[doc_id] = frequencies
+        self._lengths[doc_id] = sum(frequencies.values())
+        self._total_length += self._lengths[doc_id]
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+
+    def _remove_ids(self, doc_ids: List[str]) -> int:
+        removed = 0
+        with self._lock:
+            for doc_id in doc_ids:
+                frequencies = self._term_frequencies.pop(doc_id, None)
+                if frequencies is None:
+                    continue
+                del self._texts[doc_id]
+                self._total_length -= self._lengths.pop(doc_id)
+                for term in frequencies:
+                    postings = self._postings[term]
+                    del postings[doc_id]
+                    if not postings:
+                        del self._postings[term]
+                removed += 1
+        return removed
+
+
+class BM25IndexRetriever(BaseRetriever):
+    """
+    Langchain retriever returning the top-k chunks of a BM25Index.
+    """
+    index: BM25Index
+    k: int = 4
+    allowed_ids: Optional[FrozenSet[str]] = None
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        return [Document(page_content=text) for text, _ in self.index.search(query, self.k, self.allowed_ids)]
+
+
+def safe_name(name: str) -> str:
+    """
+    Returns a name usable as a single path component. Names that are not plain identifiers
+    are replaced by a slug plus a hash, so they can never escape the directory they are joined to.
+    """
+    if _SAFE_NAME.fullmatch(name):
+        return name
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "_", name).strip("_")[:64] or "collection"
+    return f"{slug}-{hashlib.sha1(name.encode('utf-8')).hexdigest()[:16]}"
+
+
+def index_file_name(collection_name: str) -> str:
+    """
+    Returns the file name of a collection's index.
+    """
+    return f"{safe_name(collection_name)}.json"
+
+
+def get_bm25_index(collection_name: str, index_dir: Optional[str] = None) -> BM25Index:
+    """
+    Returns the BM25 index of a collection, loading it from disk on first use so every
+    retriever in the process shares one index per collection.
+
+    The index file stores the chunk texts in plaintext. Without index_dir or BM25_INDEX_DIR
+    it is written under ~/.cache/elsai_core/bm25, readable only by the current user.
+
+    Args:
+        collection_name (str): Name of the collection the chunks belong to.
+        index_dir (str, optional): Directory of the index files. Defaults to BM25_INDEX_DIR or ~/.cache.
+
+    Returns:
+        BM25Index: The shared index.
+    """
+    index_dir = index_dir or os.getenv("BM25_INDEX_DIR", DEFAULT_INDEX_DIR)
+    path = os.path.join(index_dir, index_file_name(collection_name))
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = BM25Index(path)
+            _indexes[path] = index
+        return index
@@ -1,6 +1,7 @@
-from langchain_community.retrievers import BM25Retriever
 from langchain.retrievers import EnsembleRetriever
 from ..config.loggerConfig import setup_logger
+from .bm25_index import get_bm25_index
+from .sparse_bm25 import SparseBM25Retriever
 
 class HybridRetriever:
     """
@@ -15,14 +16,25 @@ class HybridRetriever:
         """
         self.logger = setup_logger()
 
-    def hybrid_retrieve(self, chunks: list, retrievers: list, question: str):
+    def hybrid_retrieve(self, chunks: list, retrievers: list, question: str, collection_name: str = None,
+                        k: int = 4, index_dir: str = None):
         """
         Performs a hybrid retrieval using BM25 and other retrievers, and returns the results.
 
+        With a collection name, the BM25 index of the whole collection is built once, persisted
+        and reused across questions. Chunks missing from it are added, and BM25 results are limited
+        to the given chunks, so questions over different file selections of the same collection
+        never see each other's chunks. Chunks are never removed here; use update_index for that.
+        Chunks may be None to search the whole index. Without a collection name, a temporary
+        sparse-matrix BM25 retriever is built from the chunks.
+
         Args:
             chunks (list): List of text chunks to initialize BM25 retriever.
-            retrievers (list): Existing list of retrievers to be used in the ensemble.
+            retrievers (list): Existing list of retrievers to be used in the ensemble. It is not modified.
             question (str): The query or question to perform retrieval on.
+            collection_name (str, optional): Collection whose persistent BM25 index is used.
+            k (int, optional): Number of chunks the BM25 index returns. Defaults to 4.
+            index_dir (str, optional): Directory of the persisted BM25 indexes.
 
         Returns:
             list: A list of relevant documents retrieved by the ensemble of retrievers.
@@ -30,9 +42,18 @@ class HybridRetriever:
         self.logger.info("Starting hybrid retrieval for question: '%s'.", question)
 
         try:
+            retrievers = list(retrievers)
+            if collection_name:
+                index = get_bm25_index(collection_name, index_dir)
+                added = index.add_chunks(chunks) if chunks is not None else 0
+                if added:
+                    index.save()
+                    self.logger.info("BM25 index for '%s' updated: %d chunks added.", collection_name, added)
+                retrievers.append(index.as_retriever(k=k, chunks=chunks))
+                self.logger.info("BM25 index retriever for collection '%s' added.", collection_name)
             # Initialize BM25 retriever if chunks are provided
-            if chunks:
-                bm25_retriever = BM25Retriever.from_texts(chunks)
+            elif chunks:
+                bm25_retriever = SparseBM25Retriever.from_texts(chunks, k=k)
                 retrievers.append(bm25_retriever)
                 self.logger.info("BM25 retriever initialized and added to retrievers list.")
 
@@ -50,3 +71,21 @@ class HybridRetriever:
             # Log the error and re-raise the exception
             self.logger.error("Error during hybrid retrieval: %s", e)
             raise RuntimeError("Hybrid retrieval failed.") from e
+
+    def update_index(self, collection_name: str, added_chunks: list = None, removed_chunks: list = None,
+                     index_dir: str = None):
+        """
+        Applies chunk additions and removals to the persistent BM25 index of a collection.
+
+        Args:
+            collection_name (str): Collection whose BM25 index is updated.
+            added_chunks (list, optional): Chunks added to the collection.
+            removed_chunks (list, optional): Chunks removed from the collection.
+            index_dir (str, optional): Directory of the persisted BM25 indexes.
+        """
+        index = get_bm25_index(collection_name, index_dir)
+        removed = index.remove_chunks(removed_chunks or [])
+        added = index.add_chunks(added_chunks or [])
+        if added or removed:
+            index.save()
+        self.logger.info("BM25 index for '%s' updated: %d chunks added, %d removed.", collection_name, added, removed)
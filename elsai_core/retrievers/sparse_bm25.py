@@ -0,0 +1,164 @@
+"""
+This module provides a BM25 scoring engine that stores the corpus as a sparse term-document matrix.
+"""
+
+from array import array
+from collections import Counter
+from itertools import repeat
+from typing import Callable, List, Optional, Sequence, Tuple
+import numpy as np
+from scipy import sparse
+from pydantic import ConfigDict
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from .bm25_index import tokenize
+
+
+class SparseBM25:
+    """
+    Okapi BM25 over a SciPy sparse matrix.
+
+    The BM25 weight of every (term, chunk) pair, combining IDF, term frequency saturation and
+    length normalization, is precomputed into a CSR matrix with one row per term. Scoring a
+    query is then a sparse vector-matrix product that only reads the rows of the query terms,
+    and a batch of queries is a single sparse matrix product. Top-k uses argpartition.
+    """
+    def __init__(self, texts: Sequence[str], k1: float = 1.5, b: float = 0.75,
+                 tokenizer: Callable[[str], List[str]] = tokenize):
+        """
+        Args:
+            texts (Sequence[str]): The chunks to index.
+            k1 (float): Term frequency saturation.
+            b (float): Document length normalization.
+            tokenizer (Callable): Splits a text into terms.
+        """
+        self.texts = list(texts)
+        self.k1 = k1
+        self.b = b
+        self.tokenizer = tokenizer
+        self.vocabulary = {}
+
+        # Compact typed arrays keep the build at a few bytes per (term, chunk) pair
+        rows, columns, counts = array("i"), array("i"), array("f")
+        for doc_index, text in enumerate(self.texts):
+            term_counts = Counter(self.vocabulary.setdefault(term, len(self.vocabulary)) for term in tokenizer(text))
+            rows.extend(term_counts.keys())
+            counts.extend(term_counts.values())
+            columns.extend(repeat(doc_index, len(term_counts)))
+        shape = (len(self.vocabulary), len(self.texts))
+        frequencies = sparse.csr_matrix(
+            (np.frombuffer(counts, dtype=np.float32),
+             (np.frombuffer(rows, dtype=np.int32), np.frombuffer(columns, dtype=np.int32))),
+            shape=shape
+        )
+        del rows, columns, counts
+
+        lengths = np.asarray(frequencies.sum(axis=0), dtype=np.float32).ravel()
+        average_length = lengths.mean() if len(lengths) else 0.0
+        document_frequencies = np.diff(frequencies.indptr).astype(np.float32)
+        self.idf = np.log1p((len(self.texts) - document_frequencies + 0.5) / (document_frequencies + 0.5))
+        length_norms = k1 * (1 - b + b * lengths / average_length) if average_length else np.full_like(lengths, k1)
+
+        tf = frequencies.data
+        weights = tf * (k1 + 1) / (tf + length_norms[frequencies.indices])
+        weights *= np.repeat(self.idf, np.diff(frequencies.indptr))
+        self.weights = sparse.csr_matrix((weights.astype(np.float32), frequencies.indices, frequencies.indptr),
+                                         shape=shape)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def get_scores(self, query: str) -> np.ndarray:
+        """
+        Returns the BM25 score of every chunk for the query.
+        """
+        return np.asarray(self.get_batch_scores([query]).todense()).ravel()
+
+    def get_batch_scores(self, queries: Sequence[str]) -> sparse.csr_matrix:
+        """
+        Returns a sparse (queries x chunks) matrix of BM25 scores; chunks sharing no term
+        with a query have no entry in its row.
+        """
+        return (self._query_matrix(queries) @ self.weights).tocsr()
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[int, float]]:
+        """
+        Returns (chunk index, score) of the k best matching chunks, best first.
+        """
+        return self.search_batch([query], k)[0]
+
+    def search_batch(self, queries: Sequence[str], k: int = 4) -> List[List[Tuple[int, float]]]:
+        """
+        Scores a batch of queries with one sparse matrix product.
+
+        Returns:
+            List[List[Tuple[int, float]]]: For every query, (chunk index, score) of its k best
+            matching chunks, best first. Chunks without any query term are never returned.
+        """
+        scores = self.get_batch_scores(queries)
+        results = []
+        for row in range(scores.shape[0]):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            indices, values = scores.indices[start:end], scores.data[start:end]
+            if k < len(values):
+                top = np.argpartition(-values, k - 1)[:k]
+            else:
+                top = np.arange(len(values))
+            top = top[np.argsort(-values[top], kind="stable")]
+            results.append([(int(indices[i]), float(values[i])) for i in top])
+        return results
+
+    def as_retriever(self, k: int = 4) -> "SparseBM25Retriever":
+        """
+        Returns a Langchain retriever over this engine, usable in an EnsembleRetriever.
+        """
+        return SparseBM25Retriever(engine=self, k=k)
+
+    def _query_matrix(self, queries: Sequence[str]) -> sparse.csr_matrix:
+        """
+        Builds a (queries x terms) matrix of query term counts; unknown terms are dropped.
+        """
+        rows, columns = [], []
+        for query_index, query in enumerate(queries):
+            for term in self.tokenizer(query):
+                term_index = self.vocabulary.get(term)
+                if term_index is not None:
+                    rows.append(query_index)
+                    columns.append(term_index)
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, columns)),
+            shape=(len(queries), len(self.vocabulary))
+        )
+
+
+class SparseBM25Retriever(BaseRetriever):
+    """
+    Langchain retriever returning the top-k chunks of a SparseBM25 engine.
+    """
+    engine: SparseBM25
+    k: int = 4
+    metadatas: Optional[List[dict]] = None
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @classmethod
+    def from_texts(cls, texts: Sequence[str], metadatas: Optional[List[dict]] = None, k: int = 4,
+                   **kwargs) -> "SparseBM25Retriever":
+        """
+        Builds the engine over the texts and returns a retriever on it.
+
+        Args:
+            texts (Sequence[str]): The chunks to index.
+            metadatas (List[dict], optional): Metadata of each chunk.
+            k (int): Number of chunks returned per query.
+            **kwargs: Passed to SparseBM25, e.g. k1 or b.
+        """
+        return cls(engine=SparseBM25(texts, **kwargs), k=k, metadatas=metadatas)
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        return [
+            Document(page_content=self.engine.texts[index],
+                     metadata=self.metadatas[index] if self.metadatas else {})
+            for index, _ in self.engine.search(query, self.k)
+        ]
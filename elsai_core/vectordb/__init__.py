@@ -1,8 +1,9 @@
-
 from .pinecone_vectordb import PineconeVectorDb
 from .chroma_vectordb import ChromaVectorDb
+from .local_vectordb import LocalVectorDb
 __all__ = [
     "PineconeVectorDb",
-    "ChromaVectorDb"
+    "ChromaVectorDb",
+    "LocalVectorDb"
 
-]
\ No newline at end of file
+]
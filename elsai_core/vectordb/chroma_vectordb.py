@@ -1,21 +1,76 @@
 import chromadb
 import os
+from concurrent.futures import ThreadPoolExecutor
 from elsai_core.config.loggerConfig import setup_logger
 
+DEFAULT_MAX_BATCH_SIZE = 5000
+
 class ChromaVectorDb:
-    def __init__(self, chroma_host: str = None, chroma_port: int = 8000):
+    def __init__(self, chroma_host: str = None, chroma_port: int = 8000, persist_path: str = None,
+                 embedded: bool = None):
         """
-        Initializes the ChromaVectorDb class with the specified ChromaDB host and port.
+        Initializes the ChromaVectorDb class, either against a ChromaDB server over HTTP or
+        with an embedded persistent client that stores the collections in a local directory.
 
         Args:
             chroma_host (str, optional): The host for the ChromaDB instance. Defaults to None.
             chroma_port (int, optional): The port for the ChromaDB instance. Defaults to 8000.
+            persist_path (str, optional): Directory used by the embedded client. Defaults to the
+                CHROMA_PERSIST_PATH environment variable.
+            embedded (bool, optional): Use the embedded persistent client instead of HttpClient.
+                Defaults to True when a persist path is configured, False otherwise.
         """
-        if chroma_host is None:
-            chroma_host = os.getenv('CHROMA_HOST')
-        self.chroma_client = chromadb.HttpClient(host=chroma_host, port=chroma_port)
-        self.chroma_client.api_version = "v1"
+        if persist_path is None:
+            persist_path = os.getenv('CHROMA_PERSIST_PATH')
+        if embedded is None:
+            embedded = persist_path is not None
         self.logger = setup_logger()
+        self.embedded = embedded
+        if embedded:
+            if persist_path is None:
+                raise ValueError("persist_path or CHROMA_PERSIST_PATH is required for the embedded client")
+            self.logger.info(f"Using embedded ChromaDB client persisted at '{persist_path}'.")
+            self.chroma_client = chromadb.PersistentClient(path=persist_path)
+        else:
+            if chroma_host is None:
+                chroma_host = os.getenv('CHROMA_HOST')
+            self.chroma_client = chromadb.HttpClient(host=chroma_host, port=chroma_port)
+            self.chroma_client.api_version = "v1"
+        self._collections = {}
+        self._max_batch_size = None
+
+    def _get_or_create_collection(self, collection_name: str):
+        """
+        Returns the collection handle, creating the collection on first use. Handles are
+        cached so repeated adds and queries do not re-list or re-fetch collections.
+        """
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            collection = self.chroma_client.get_or_create_collection(name=collection_name)
+            self._collections[collection_name] = collection
+        return collection
+
+    def _get_cached_collection(self, collection_name: str):
+        """
+        Returns the cached handle of an existing collection, fetching it on first use.
+        """
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            collection = self.chroma_client.get_collection(name=collection_name)
+            self._collections[collection_name] = collection
+        return collection
+
+    def get_max_batch_size(self) -> int:
+        """
+        Returns the maximum number of records the Chroma server accepts in a single add.
+        """
+        if self._max_batch_size is None:
+            try:
+                self._max_batch_size = self.chroma_client.get_max_batch_size()
+            except Exception as exc:
+                self.logger.info(f"Could not read max batch size from server, using default: {exc}")
+                self._max_batch_size = DEFAULT_MAX_BATCH_SIZE
+        return self._max_batch_size
 
     def create_if_not_exists(self, collection_name: str):
         """
@@ -40,8 +95,7 @@ class ChromaVectorDb:
         """
         self.logger.info(f"Adding document with id '{document['id']}' to collection '{collection_name}'.")
         try:
-            self.create_if_not_exists(collection_name)
-            collection = self.chroma_client.get_collection(name=collection_name)
+            collection = self._get_or_create_collection(collection_name)
         except Exception as exc:
             self.logger.error(f"Error retrieving or creating collection: {exc}")
             raise RuntimeError(f"collection:'{collection_name}' does not exist") from exc
@@ -51,7 +105,49 @@ class ChromaVectorDb:
                        metadatas=[document['metadatas']])
         self.logger.info(f"Document with id '{document['id']}' added successfully.")
 
-    def retrieve_document(self, collection_name: str, embeddings: list, files_id: list=None, k: int = 10):
+    def add_documents(self, documents: list, collection_name: str, batch_size: int = None,
+                      max_workers: int = 4) -> None:
+        """
+        Adds many documents to a ChromaDB collection in batches sent concurrently.
+
+        Args:
+            documents (list): Dictionaries containing 'id', 'embeddings', 'page_content', and 'metadatas'.
+            collection_name (str): The name of the collection to add the documents to.
+            batch_size (int, optional): Records per request. Defaults to (and is capped at)
+                the server's max batch size.
+            max_workers (int, optional): Number of batches in flight at once. Defaults to 4.
+                Ignored by the embedded client, whose writes are serialized anyway.
+        """
+        if not documents:
+            return
+        try:
+            collection = self._get_or_create_collection(collection_name)
+        except Exception as exc:
+            self.logger.error(f"Error retrieving or creating collection: {exc}")
+            raise RuntimeError(f"collection:'{collection_name}' does not exist") from exc
+
+        max_batch_size = self.get_max_batch_size()
+        batch_size = min(batch_size or max_batch_size, max_batch_size)
+        batches = [documents[start:start + batch_size] for start in range(0, len(documents), batch_size)]
+        self.logger.info(
+            f"Adding {len(documents)} documents to collection '{collection_name}' in {len(batches)} batches."
+        )
+
+        def add_batch(batch):
+            collection.add(ids=[document["id"] for document in batch],
+                           embeddings=[document["embeddings"] for document in batch],
+                           documents=[document["page_content"] for document in batch],
+                           metadatas=[document["metadatas"] for document in batch])
+
+        if self.embedded:
+            max_workers = 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # list() surfaces the first failed batch as an exception
+            list(executor.map(add_batch, batches))
+        self.logger.info(f"{len(documents)} documents added to collection '{collection_name}'.")
+
+    def retrieve_document(self, collection_name: str, embeddings: list, files_id: list=None, k: int = 10,
+                          include: list = None):
         """
         Retrieves documents from a ChromaDB collection based on the query embeddings and file IDs.
 
@@ -60,27 +156,73 @@ class ChromaVectorDb:
             embeddings (list): The embeddings to use for the query.
             files_id (list): The list of file IDs to filter by.
             k (int, optional): The number of results to retrieve. Defaults to 10.
+            include (list, optional): Fields to return, e.g. ["documents", "distances"].
+                Defaults to Chroma's default (documents, metadatas and distances).
 
         Returns:
             dict: The results of the query.
         """
         self.logger.info(f"Retrieving documents from collection '{collection_name}' with k={k}.")
         try:
-            collection = self.chroma_client.get_collection(name=collection_name)
+            collection = self._get_cached_collection(collection_name)
         except Exception as exc:
             self.logger.error(f"Error retrieving collection: {exc}")
             raise RuntimeError(f"collection:'{collection_name}' does not exist") from exc
         query_filter = {}
         if files_id:
             query_filter = {"file_id": {"$in": files_id}}
+        query_kwargs = {"include": include} if include else {}
         results = collection.query(
             query_embeddings=[embeddings],
             n_results=k,
-            where=query_filter
+            where=query_filter,
+            **query_kwargs
         )
-        self.logger.info(f"Retrieved {len(results['documents'])} documents.")
+        self.logger.info(f"Retrieved {len(results['ids'][0])} documents.")
         return results
 
+    def retrieve_documents(self, collection_name: str, embeddings_list: list, files_id: list = None,
+                           k: int = 10, include: list = None):
+        """
+        Retrieves documents for many query embeddings with as few requests as possible.
+
+        Args:
+            collection_name (str): The name of the collection to query.
+            embeddings_list (list): The query embeddings, one per question.
+            files_id (list, optional): The list of file IDs to filter by.
+            k (int, optional): The number of results to retrieve per query. Defaults to 10.
+            include (list, optional): Fields to return, e.g. ["documents", "distances"].
+
+        Returns:
+            dict: Query results with one entry per query embedding in every field, in input order.
+        """
+        self.logger.info(
+            f"Retrieving documents for {len(embeddings_list)} queries from collection '{collection_name}' with k={k}."
+        )
+        try:
+            collection = self._get_cached_collection(collection_name)
+        except Exception as exc:
+            self.logger.error(f"Error retrieving collection: {exc}")
+            raise RuntimeError(f"collection:'{collection_name}' does not exist") from exc
+        query_kwargs = {"include": include} if include else {}
+        if files_id:
+            query_kwargs["where"] = {"file_id": {"$in": files_id}}
+
+        batch_size = self.get_max_batch_size()
+        merged = {}
+        for start in range(0, len(embeddings_list), batch_size):
+            results = collection.query(
+                query_embeddings=embeddings_list[start:start + batch_size],
+                n_results=k,
+                **query_kwargs
+            )
+            for field, values in results.items():
+                if isinstance(values, list):
+                    merged.setdefault(field, []).extend(values)
+                elif field not in merged:
+                    merged[field] = values
+        return merged
+
     def get_collection(self, collection_name):
         """
         Retrieves a ChromaDB collection by name.
@@ -93,31 +235,71 @@ class ChromaVectorDb:
         """
         self.logger.info(f"Retrieving collection '{collection_name}'.")
         try:
-            collection = self.chroma_client.get_collection(name=collection_name)
+            collection = self._get_cached_collection(collection_name)
             return collection
         except Exception as exc:
             self.logger.error(f"Error retrieving collection: {exc}")
             raise RuntimeError(f"collection:'{collection_name}' does not exist") from exc
 
-    def fetch_chunks(self, collection_name: str, files_id: list):
+    def fetch_chunks(self, collection_name: str, files_id: list, page_size: int = 1000):
         """
         Fetches text chunks from the ChromaDB collection based on the collection name.
+        Only documents are transferred, in pages of page_size records.
 
         Args:
             collection_name (str): The name of the collection to fetch data from.
+            files_id (list): The list of file IDs to filter by. An empty list fetches nothing.
+            page_size (int, optional): Records fetched per request. Defaults to 1000.
 
         Returns:
             list: A list of text chunks from the collection.
         """
         self.logger.info(f"Fetching chunks from collection '{collection_name}'.")
-        collection = self.chroma_client.get_collection(name=collection_name)
-        collection_results = collection.get(
-            where={"file_id": {"$in": files_id}}
-        )
-        chunks = [item for item in collection_results['documents'] if item]
+        chunks = [
+            record["document"]
+            for record in self.iter_records(collection_name, files_id, include=["documents"], page_size=page_size)
+            if record["document"]
+        ]
         self.logger.info(f"Fetched {len(chunks)} chunks.")
         return chunks
-    
+
+    def iter_records(self, collection_name: str, files_id: list = None, include: list = None,
+                     page_size: int = 1000):
+        """
+        Lazily iterates over the records of a collection using limit/offset pagination, so
+        memory stays bounded by page_size regardless of the collection size.
+
+        Args:
+            collection_name (str): The name of the collection to read.
+            files_id (list, optional): The list of file IDs to filter by. None reads every record;
+                an empty list reads none.
+            include (list, optional): Fields to transfer: any of "documents", "metadatas",
+                "embeddings". Defaults to ["documents", "metadatas"].
+            page_size (int, optional): Records fetched per request. Defaults to 1000.
+
+        Yields:
+            dict: One record per item with 'id' and the singular form of each included field
+            ('document', 'metadata', 'embedding').
+        """
+        include = list(include or ["documents", "metadatas"])
+        collection = self._get_cached_collection(collection_name)
+        if files_id is not None and not files_id:
+            return
+        query_filter = {"where": {"file_id": {"$in": files_id}}} if files_id is not None else {}
+        offset = 0
+        while True:
+            page = collection.get(limit=page_size, offset=offset, include=include, **query_filter)
+            ids = page["ids"]
+            for index, record_id in enumerate(ids):
+                record = {"id": record_id}
+                for field in include:
+                    values = page.get(field)
+                    record[field[:-1]] = values[index] if values is not None else None
+                yield record
+            if len(ids) < page_size:
+                return
+            offset += page_size
+
     def delete_collection(self, collection_name:str):
         """
         Deletes a collection from ChromaDB.
@@ -129,6 +311,7 @@ class ChromaVectorDb:
         if collection_exists:
             self.logger.info(f"Deleting collection '{collection_name}'.")
             try:
+                self._collections.pop(collection_name, None)
                 self.chroma_client.delete_collection(name=collection_name)
             except Exception as exc:
                 self.logger.error(f"Error deleting collection: {exc}")
@@ -0,0 +1,389 @@
+import os
+import json
+import shutil
+import threading
+import numpy as np
+from elsai_core.config.loggerConfig import setup_logger
+from ..retrievers.bm25_index import safe_name
+
+DEFAULT_BASE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "elsai_core", "vectors")
+INITIAL_CAPACITY = 1024
+# Rows scored per matrix product; keeps the temporary float32 copy of int8 rows cache-sized.
+# NumPy has no BLAS int8 product, so int8 rows are widened to float32 before scoring.
+SCORE_CHUNK_ROWS = 4096
+
+
+class _Collection:
+    """
+    On-disk state of one collection: memory-mapped vector matrices plus the metadata side table.
+    """
+    def __init__(self, path: str, dimension: int, quantized: bool):
+        self.path = path
+        self.dimension = dimension
+        self.quantized = quantized
+        self.count = 0
+        self.capacity = 0
+        self.vectors = None
+        self.int8_vectors = None
+        self.scales = None
+        self.ids = []
+        self.id_set = set()
+        self.documents = []
+        self.metadatas = []
+        self.file_codes = np.zeros(0, dtype=np.int32)
+        self.file_code_by_id = {}
+
+    def file_code(self, file_id) -> int:
+        return self.file_code_by_id.setdefault(file_id, len(self.file_code_by_id))
+
+
+class LocalVectorDb:
+    """
+    LocalVectorDb is an in-process vector store that needs no server.
+
+    Each collection is a directory holding a memory-mapped float32 matrix of L2-normalized
+    vectors and a JSON-lines side table of ids, page contents and metadata. Queries are
+    brute-force cosine similarity with NumPy, filtered by file_id. With quantize=True an
+    int8 copy of the matrix is scanned first and the best candidates are re-ranked against
+    the float32 vectors. The int8 matrix is a quarter of the size, so it stays resident in
+    memory for collections whose float32 matrix does not; only the shortlisted float32 rows
+    are read from disk per query.
+
+    Quantization is a memory tradeoff, not a speed-up: the int8 rows are widened to float32
+    before scoring, so when the float32 matrix fits in memory a quantized scan is somewhat
+    slower than a plain one. Both scan every candidate row on each query.
+
+    Results use the same layout as ChromaVectorDb.retrieve_document, with cosine distances.
+    """
+
+    def __init__(self, base_path: str = None, quantize: bool = False, rerank_factor: int = 4):
+        """
+        Initializes the LocalVectorDb.
+
+        Args:
+            base_path (str, optional): Directory holding the collections. Defaults to
+                LOCAL_VECTORDB_PATH or ~/.cache/elsai_core/vectors.
+            quantize (bool): Keep an int8 copy of new collections for the first scan pass. Only
+                worth it when the float32 vectors do not fit in memory.
+            rerank_factor (int): With quantization, candidates re-ranked per requested result.
+        """
+        self.logger = setup_logger()
+        self.base_path = base_path or os.getenv("LOCAL_VECTORDB_PATH", DEFAULT_BASE_PATH)
+        self.quantize = quantize
+        self.rerank_factor = rerank_factor
+        self._collections = {}
+        self._lock = threading.RLock()
+        os.makedirs(self.base_path, exist_ok=True)
+
+    def create_if_not_exists(self, collection_name: str, dimension: int = None):
+        """
+        Makes sure a collection is available, loading it from disk or preparing a new one.
+        A new collection is written on its first add, once its dimension is known.
+
+        Args:
+            collection_name (str): The name of the collection.
+            dimension (int, optional): Vector dimension of a new collection.
+        """
+        with self._lock:
+            if collection_name in self._collections:
+                return
+            collection = self._load(collection_name)
+            if collection is None and dimension is not None:
+                self.logger.info(f"Creating local collection '{collection_name}'.")
+                collection = self._create(collection_name, dimension)
+            if collection is not None:
+                self._collections[collection_name] = collection
+
+    def add_document(self, document, collection_name: str) -> None:
+        """
+        Adds a document to a collection, creating the collection on first use.
+
+        Args:
+            document (dict): A dictionary containing 'id', 'embeddings', 'page_content', and 'metadatas'.
+            collection_name (str): The name of the collection to add the document to.
+        """
+        self.add_documents([document], collection_name)
+
+    def add_documents(self, documents: list, collection_name: str) -> None:
+        """
+        Adds many documents to a collection in one write. Documents whose id is already in
+        the collection are skipped.
+
+        Args:
+            documents (list): Dictionaries containing 'id', 'embeddings', 'page_content', and 'metadatas'.
+            collection_name (str): The name of the collection to add the documents to.
+        """
+        if not documents:
+            return
+        with self._lock:
+            collection = self._get(collection_name, create_dimension=len(documents[0]["embeddings"]))
+            new_documents, seen = [], set()
+            for document in documents:
+                if document["id"] in collection.id_set or document["id"] in seen:
+                    continue
+                seen.add(document["id"])
+                new_documents.append(document)
+            skipped = len(documents) - len(new_documents)
+            if skipped:
+                self.logger.info(f"Skipping {skipped} documents already in collection '{collection_name}'.")
+            if not new_documents:
+                return
+
+            vectors = np.asarray([document["embeddings"] for document in new_documents], dtype=np.float32)
+            if vectors.shape[1] != collection.dimension:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match collection "
+                    f"dimension {collection.dimension}."
+                )
+            vectors = _normalize(vectors)
+            start, end = collection.count, collection.count + len(new_documents)
+            if end > collection.capacity:
+                self._grow(collection, max(end, collection.capacity * 2))
+            collection.vectors[start:end] = vectors
+            collection.vectors.flush()
+            if collection.quantized:
+                scales = np.abs(vectors).max(axis=1) / 127.0
+                scales[scales == 0] = 1.0
+                collection.int8_vectors[start:end] = np.round(vectors / scales[:, None]).astype(np.int8)
+                collection.scales[start:end] = scales
+                collection.int8_vectors.flush()
+                collection.scales.flush()
+
+            with open(os.path.join(collection.path, "records.jsonl"), "a", encoding="utf-8") as f:
+                for document in new_documents:
+                    f.write(json.dumps({
+                        "id": document["id"],
+                        "page_content": document.get("page_content"),
+                        "metadatas": document.get("metadatas") or {},
+                    }) + "\n")
+            for document in new_documents:
+                self._append_record(collection, document["id"], document.get("page_content"),
+                                    document.get("metadatas") or {})
+            collection.count = end
+            self._save_header(collection)
+        self.logger.info(f"{len(new_documents)} documents added to local collection '{collection_name}'.")
+
+    def retrieve_document(self, collection_name: str, embeddings: list, files_id: list = None, k: int = 10):
+        """
+        Retrieves the documents most similar to the query embeddings, optionally limited to file IDs.
+
+        Args:
+            collection_name (str): The name of the collection to query.
+            embeddings (list): The embeddings to use for the query.
+            files_id (list, optional): The list of file IDs to filter by. None searches every file.
+            k (int, optional): The number of results to retrieve. Defaults to 10.
+
+        Returns:
+            dict: 'ids', 'documents', 'metadatas' and 'distances' (1 - cosine similarity),
+            each a list holding one list of results, best first.
+        """
+        with self._lock:
+            collection = self._get(collection_name)
+            count = collection.count
+            rows = self._filter_rows(collection, files_id)
+        query = _normalize(np.asarray(embeddings, dtype=np.float32)[None, :])[0]
+        indices, scores = self._search(collection, query, count, rows, k)
+        self.logger.info(f"Retrieved {len(indices)} documents from local collection '{collection_name}'.")
+        return {
+            "ids": [[collection.ids[i] for i in indices]],
+            "documents": [[collection.documents[i] for i in indices]],
+            "metadatas": [[collection.metadatas[i] for i in indices]],
+            "distances": [[float(1.0 - score) for score in scores]],
+        }
+
+    def fetch_chunks(self, collection_name: str, files_id: list):
+        """
+        Fetches the text chunks of a collection, optionally limited to file IDs.
+
+        Args:
+            collection_name (str): The name of the collection to fetch data from.
+            files_id (list): The list of file IDs to filter by. None fetches every file.
+
+        Returns:
+            list: A list of text chunks from the collection.
+        """
+        with self._lock:
+            collection = self._get(collection_name)
+            rows = self._filter_rows(collection, files_id)
+            indices = range(collection.count) if rows is None else rows
+            chunks = [collection.documents[i] for i in indices if collection.documents[i]]
+        self.logger.info(f"Fetched {len(chunks)} chunks.")
+        return chunks
+
+    def delete_collection(self, collection_name: str):
+        """
+        Deletes a collection and its files.
+
+        Args:
+            collection_name (str): The name of the collection to delete.
+        """
+        with self._lock:
+            path = self._path(collection_name)
+            if not os.path.isdir(path):
+                self.logger.error(f"Collection '{collection_name}' does not exist.")
+                raise RuntimeError(f"Collection '{collection_name}' does not exist.")
+            self.logger.info(f"Deleting local collection '{collection_name}'.")
+            base_path = os.path.realpath(self.base_path)
+            real_path = os.path.realpath(path)
+            if os.path.dirname(real_path) != base_path:
+                raise RuntimeError(f"Refusing to delete '{real_path}' outside '{base_path}'.")
+            collection = self._collections.pop(collection_name, None)
+            if collection is not None:
+                # Release the memory maps before removing their files
+                collection.vectors = collection.int8_vectors = collection.scales = None
+            shutil.rmtree(real_path)
+
+    def _search(self, collection: _Collection, query: np.ndarray, count: int, rows, k: int):
+        """
+        Returns the indices and cosine similarities of the top-k rows, best first.
+        """
+        candidates = count if rows is None else len(rows)
+        if candidates == 0 or k <= 0:
+            return [], []
+        if collection.quantized and candidates > k * self.rerank_factor:
+            approximate = _scores(collection.int8_vectors, query, count, rows) * _take(collection.scales, count, rows)
+            shortlist = _top_k(approximate, k * self.rerank_factor)
+            # Sorted row order keeps the reads from the memory map sequential
+            shortlist_rows = np.sort(shortlist if rows is None else rows[shortlist])
+            exact = collection.vectors[shortlist_rows] @ query
+            order = _top_k(exact, k)
+            return shortlist_rows[order].tolist(), exact[order].tolist()
+        scores = _scores(collection.vectors, query, count, rows)
+        order = _top_k(scores, k)
+        indices = order if rows is None else rows[order]
+        return indices.tolist(), scores[order].tolist()
+
+    @staticmethod
+    def _filter_rows(collection: _Collection, files_id: list):
+        """
+        Returns the row indices whose file_id is in files_id, or None for no filter.
+        Only None means no filter; an empty list matches no rows.
+        """
+        if files_id is None:
+            return None
+        codes = [collection.file_code_by_id[file_id] for file_id in files_id if file_id in collection.file_code_by_id]
+        return np.flatnonzero(np.isin(collection.file_codes[:collection.count], codes))
+
+    def _get(self, collection_name: str, create_dimension: int = None) -> _Collection:
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            self.create_if_not_exists(collection_name, create_dimension)
+            collection = self._collections.get(collection_name)
+        if collection is None:
+            raise RuntimeError(f"collection:'{collection_name}' does not exist")
+        return collection
+
+    def _path(self, collection_name: str) -> str:
+        # Sanitized so a name like '../..' or an absolute path stays inside base_path
+        return os.path.join(self.base_path, safe_name(collection_name))
+
+    def _create(self, collection_name: str, dimension: int) -> _Collection:
+        collection = _Collection(self._path(collection_name), dimension, self.quantize)
+        os.makedirs(collection.path, exist_ok=True)
+        self._grow(collection, INITIAL_CAPACITY)
+        self._save_header(collection)
+        return collection
+
+    def _load(self, collection_name: str):
+        path = self._path(collection_name)
+        header_path = os.path.join(path, "index.json")
+        if not os.path.exists(header_path):
+            return None
+        with open(header_path, "r", encoding="utf-8") as f:
+            header = json.load(f)
+        collection = _Collection(path, header["dimension"], header["quantized"])
+        collection.count = header["count"]
+        collection.capacity = header["capacity"]
+        self._map(collection)
+        records_path = os.path.join(path, "records.jsonl")
+        if os.path.exists(records_path):
+            with open(records_path, "r+b") as f:
+                for _ in range(collection.count):
+                    record = json.loads(f.readline())
+                    self._append_record(collection, record["id"], record["page_content"], record["metadatas"])
+                # Records past the committed count belong to an interrupted add
+                f.truncate(f.tell())
+        self.logger.info(f"Loaded local collection '{collection_name}' with {collection.count} vectors.")
+        return collection
+
+    @staticmethod
+    def _append_record(collection: _Collection, record_id, page_content, metadata):
+        index = len(collection.ids)
+        collection.ids.append(record_id)
+        collection.id_set.add(record_id)
+        collection.documents.append(page_content)
+        collection.metadatas.append(metadata)
+        if index >= len(collection.file_codes):
+            collection.file_codes = np.resize(collection.file_codes, max(collection.capacity, index + 1))
+        collection.file_codes[index] = collection.file_code(metadata.get("file_id"))
+
+    def _grow(self, collection: _Collection, capacity: int):
+        """
+        Extends the backing files to hold capacity vectors and remaps them.
+        """
+        files = [("vectors.f32", 4 * collection.dimension)]
+        if collection.quantized:
+            files += [("vectors.i8", collection.dimension), ("scales.f32", 4)]
+        for name, row_bytes in files:
+            with open(os.path.join(collection.path, name), "a+b") as f:
+                f.truncate(capacity * row_bytes)
+        collection.capacity = capacity
+        self._map(collection)
+
+    @staticmethod
+    def _map(collection: _Collection):
+        capacity, dimension = collection.capacity, collection.dimension
+        collection.vectors = np.memmap(os.path.join(collection.path, "vectors.f32"), dtype=np.float32,
+                                       mode="r+", shape=(capacity, dimension))
+        if collection.quantized:
+            collection.int8_vectors = np.memmap(os.path.join(collection.path, "vectors.i8"), dtype=np.int8,
+                                                mode="r+", shape=(capacity, dimension))
+            collection.scales = np.memmap(os.path.join(collection.path, "scales.f32"), dtype=np.float32,
+                                          mode="r+", shape=(capacity,))
+
+    @staticmethod
+    def _save_header(collection: _Collection):
+        header_path = os.path.join(collection.path, "index.json")
+        tmp_path = f"{header_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "dimension": collection.dimension,
+                "count": collection.count,
+                "capacity": collection.capacity,
+                "quantized": collection.quantized,
+            }, f)
+        os.replace(tmp_path, header_path)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _take(array: np.ndarray, count: int, rows) -> np.ndarray:
+    return array[:count] if rows is None else array[rows]
+
+
+def _scores(matrix: np.ndarray, query: np.ndarray, count: int, rows) -> np.ndarray:
+    """
+    Dot products of the query with the first count rows (or the given rows), in chunks.
+    """
+    total = count if rows is None else len(rows)
+    scores = np.empty(total, dtype=np.float32)
+    for start in range(0, total, SCORE_CHUNK_ROWS):
+        end = min(start + SCORE_CHUNK_ROWS, total)
+        block = matrix[start:end] if rows is None else matrix[rows[start:end]]
+        scores[start:end] = block.astype(np.float32, copy=False) @ query
+    return scores
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first.
+    """
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
@@ -1,7 +1,15 @@
 from pinecone.grpc import PineconeGRPC as Pinecone
 from pinecone import ServerlessSpec
 from elsai_core.config.loggerConfig import setup_logger
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+import json
 import os
+import inspect
+
+# Pinecone upsert request limits
+MAX_VECTORS_PER_UPSERT = 1000
+MAX_UPSERT_BYTES = 2 * 1024 * 1024
 
 class PineconeVectorDb:
     """
@@ -10,10 +18,12 @@ class PineconeVectorDb:
     Key Methods:
     1. __init__() - Initializes Pinecone index, creating it if necessary.
     2. add_document() - Adds or updates documents in the Pinecone index.
-    3. retrieve_document() - Retrieves relevant documents from the index based on embeddings and filters.
+    3. add_documents() - Upserts many documents in size-limited batches sent concurrently.
+    4. retrieve_document() - Retrieves relevant documents from the index based on embeddings and filters.
+    5. retrieve_from_namespaces() - Queries several namespaces in parallel and merges the top-k.
     """
 
-    def __init__(self, index_name: str, dimension: int = 1536):
+    def __init__(self, index_name: str, dimension: int = 1536, index=None):
         """
         Initializes the PineconeVectorDb and ensures the index exists. If the index does not exist,
         it is created with the specified dimension.
@@ -21,14 +31,20 @@ class PineconeVectorDb:
         Args:
             index_name (str): The name of the Pinecone index to use.
             dimension (int): Dimensionality of the embeddings. Default is 1536.
+            index (optional): An index object to use instead of connecting to Pinecone, e.g. a
+                local fake exposing upsert() and query() for tests.
 
         Raises:
             Exception: If Pinecone index creation or initialization fails.
         """
         self.logger = setup_logger()
+        self.index_name = index_name
+        if index is not None:
+            self.index = index
+            self.logger.info(f"Using provided index object for '{self.index_name}'.")
+            return
         pinecone = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
         existing_indexes = [index['name'] for index in pinecone.list_indexes()]
-        self.index_name = index_name
         if index_name not in existing_indexes:
             self.logger.info(f"Creating Pinecone index: {self.index_name} with dimension {dimension}")
             pinecone.create_index(self.index_name, dimension=dimension,
@@ -66,6 +82,90 @@ class PineconeVectorDb:
             self.logger.info(f"Failed to add document to index '{self.index_name}': {exc}")
             raise RuntimeError(f"Failed to add document to Pinecone: {str(exc)}") from exc
 
+    def add_documents(self, documents: list, namespace: str, batch_size: int = MAX_VECTORS_PER_UPSERT,
+                      max_in_flight: int = 8) -> int:
+        """
+        Upserts many documents in batches that respect Pinecone's request limits
+        (vector count and payload size), keeping several batches in flight over the gRPC client.
+
+        Args:
+            documents (list): Dictionaries containing 'id', 'embeddings' and optional 'metadatas'.
+            namespace (str): The namespace to add the documents to.
+            batch_size (int): Maximum vectors per upsert request. Default is 1000.
+            max_in_flight (int): Maximum concurrent upsert requests. Default is 8.
+
+        Returns:
+            int: Number of vectors upserted.
+
+        Raises:
+            ValueError: If a document lacks required fields ('id' or 'embeddings').
+            RuntimeError: If any batch fails to upsert.
+        """
+        batches = list(self._batch_vectors(documents, min(batch_size, MAX_VECTORS_PER_UPSERT)))
+        self.logger.info(
+            f"Upserting {len(documents)} documents to index '{self.index_name}' in {len(batches)} batches."
+        )
+        upserted = 0
+        in_flight = deque()
+        try:
+            for batch in batches:
+                if len(in_flight) >= max_in_flight:
+                    upserted += self._upserted_count(in_flight.popleft().result())
+                in_flight.append(self._upsert_async(batch, namespace))
+            while in_flight:
+                upserted += self._upserted_count(in_flight.popleft().result())
+        except Exception as exc:
+            self.logger.error(f"Failed to upsert batch to index '{self.index_name}': {exc}")
+            raise RuntimeError(f"Failed to add documents to Pinecone: {str(exc)}") from exc
+        self.logger.info(f"Upserted {upserted} documents to index '{self.index_name}'.")
+        return upserted
+
+    def _batch_vectors(self, documents: list, batch_size: int):
+        """
+        Yields lists of (id, values, metadata) tuples bounded by count and estimated request size.
+        """
+        batch, batch_bytes = [], 0
+        for document in documents:
+            if "id" not in document or "embeddings" not in document:
+                raise ValueError("Document must contain 'id' and 'embeddings'.")
+            metadata = document.get("metadatas", {})
+            # float32 values plus the serialized id and metadata, with some framing overhead
+            size = 4 * len(document["embeddings"]) + len(document["id"]) + len(json.dumps(metadata)) + 64
+            if batch and (len(batch) >= batch_size or batch_bytes + size > MAX_UPSERT_BYTES):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append((document["id"], document["embeddings"], metadata))
+            batch_bytes += size
+        if batch:
+            yield batch
+
+    def _upsert_async(self, vectors: list, namespace: str):
+        """
+        Starts an upsert and returns an object whose result() waits for it. The gRPC client
+        returns a future with async_req=True; other index objects are called synchronously.
+        """
+        if self._supports_async_upsert():
+            return self.index.upsert(vectors=vectors, namespace=namespace, async_req=True)
+        return _CompletedCall(self.index.upsert(vectors=vectors, namespace=namespace))
+
+    def _supports_async_upsert(self) -> bool:
+        """
+        Checks once whether the index's upsert() accepts async_req, so a batch is never sent twice.
+        """
+        if not hasattr(self, "_async_upsert"):
+            try:
+                self._async_upsert = "async_req" in inspect.signature(self.index.upsert).parameters
+            except (TypeError, ValueError):
+                self._async_upsert = False
+        return self._async_upsert
+
+    @staticmethod
+    def _upserted_count(response) -> int:
+        count = getattr(response, "upserted_count", None)
+        if count is None and isinstance(response, dict):
+            count = response.get("upserted_count")
+        return count or 0
+
     def retrieve_document(self, namespace:str, question_embedding: list, files_id: list, k: int = 10):
         """
         Retrieves documents from the Pinecone index by querying with embeddings and applying a file ID filter.
@@ -82,17 +182,75 @@ class PineconeVectorDb:
         Raises:
             Exception: If the query operation fails.
         """
-        self.logger.info(f"Attempting to retrieve documents from index '{self.index_name}' with embeddings: {question_embedding} and files_id: {files_id}")
-        # Construct the query filter for the file IDs
-        filter_condition = {"file_id": {"$in": files_id}}
-        
-        # Query the Pinecone index with embeddings and filter conditions
-        results = self.index.query(
+        self.logger.info(
+            f"Retrieving top {k} documents from index '{self.index_name}', namespace '{namespace}', "
+            f"filtered to {len(files_id) if files_id else 0} file ids."
+        )
+        results = self._query(namespace, question_embedding, files_id, k)
+        self.logger.info(f"Query successful. Retrieved {len(results['matches'])} results.")
+        return results
+
+    def retrieve_from_namespaces(self, namespaces: list, question_embedding: list, files_id: list = None,
+                                 k: int = 10, higher_is_better: bool = True, max_workers: int = None) -> dict:
+        """
+        Queries several namespaces in parallel and merges the matches into a single top-k.
+
+        Args:
+            namespaces (list): The namespaces to query.
+            question_embedding (list): Embeddings to use for the similarity search.
+            files_id (list, optional): List of file IDs to filter results by.
+            k (int): The number of top results to return overall. Default is 10.
+            higher_is_better (bool): True for cosine and dotproduct indexes, False for euclidean.
+            max_workers (int, optional): Concurrent queries. Defaults to one per namespace.
+
+        Returns:
+            dict: {"matches": [...]} where each match is a dict with 'id', 'score', 'metadata'
+            and the 'namespace' it came from, best first.
+
+        Raises:
+            Exception: If any namespace query fails.
+        """
+        if not namespaces:
+            return {"matches": []}
+        self.logger.info(
+            f"Retrieving top {k} documents from {len(namespaces)} namespaces of index '{self.index_name}'."
+        )
+        with ThreadPoolExecutor(max_workers=max_workers or len(namespaces)) as executor:
+            responses = list(executor.map(
+                lambda namespace: self._query(namespace, question_embedding, files_id, k), namespaces
+            ))
+        matches = [
+            {
+                "id": match["id"],
+                "score": match["score"],
+                "metadata": match["metadata"],
+                "namespace": namespace,
+            }
+            for namespace, response in zip(namespaces, responses)
+            for match in response["matches"]
+        ]
+        matches.sort(key=lambda match: match["score"], reverse=higher_is_better)
+        self.logger.info(f"Query successful. Merged {len(matches)} results into top {min(k, len(matches))}.")
+        return {"matches": matches[:k]}
+
+    def _query(self, namespace: str, question_embedding: list, files_id: list, k: int):
+        # An empty list still filters (and matches nothing); only None searches every file
+        query_kwargs = {"filter": {"file_id": {"$in": files_id}}} if files_id is not None else {}
+        return self.index.query(
             namespace=namespace,
             vector=question_embedding,
             top_k=k,
-            filter=filter_condition,
-            include_metadata=True
+            include_metadata=True,
+            **query_kwargs
         )
-        self.logger.info(f"Query successful. Retrieved {len(results['matches'])} results.")
-        return results
+
+
+class _CompletedCall:
+    """
+    Wraps the result of a synchronous call so it can be awaited like a future.
+    """
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
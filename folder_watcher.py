@@ -0,0 +1,274 @@
+"""
+Hot-folder watcher that processes new invoices and timesheets as soon as they land in a folder.
+
+Usage:
+    python folder_watcher.py /mnt/scans --document-type Invoice --workers 4
+
+Results are written beside each input as `<name>.result.md`; failures as `<name>.error.txt`;
+files whose content was already processed get `<name>.duplicate.txt` naming the original.
+Install `watchdog` (see requirements.txt) for inotify events; without it the folder is polled.
+"""
+import os
+import json
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from elsai_core.config.loggerConfig import setup_logger
+from invoice_pipeline import process_pdf_file
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog is optional; fall back to polling
+    FileSystemEventHandler = object
+    Observer = None
+
+logger = setup_logger()
+
+RESULT_SUFFIX = ".result.md"
+ERROR_SUFFIX = ".error.txt"
+DUPLICATE_SUFFIX = ".duplicate.txt"
+HASHES_FILE = ".processed_hashes.json"
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """
+    Compute the SHA-256 of a file without loading it into memory.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_atomic(path, content):
+    """
+    Write a text file via a temporary file so readers never see partial output.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+class _EventHandler(FileSystemEventHandler):
+    """
+    Forwards file system events to the watcher's debounce queue.
+    """
+    def __init__(self, watcher):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.watcher.touch(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.watcher.touch(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.watcher.touch(event.dest_path)
+
+
+class HotFolderWatcher:
+    """
+    Watches a folder for new PDFs and feeds them into the extraction pipeline.
+
+    Files are only picked up once their size and modification time have been stable for
+    `debounce_seconds`, so partially copied scans are never processed. Content hashes of
+    processed files are persisted, so re-dropped duplicates are skipped; a hash is reserved
+    before processing starts, so identical files dropped together are only processed once.
+    """
+    def __init__(self, watch_dir, document_type="Invoice", workers=4, debounce_seconds=5.0,
+                 poll_interval=2.0, use_polling=False):
+        self.watch_dir = os.path.abspath(watch_dir)
+        self.document_type = document_type
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval = poll_interval
+        self.use_polling = use_polling or Observer is None
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.hashes_path = os.path.join(self.watch_dir, HASHES_FILE)
+        self.processed_hashes = self._load_hashes()
+        self.reserved_hashes = {}  # hash -> name of the file currently being processed
+        self.pending = {}  # path -> (size, mtime, time of last change)
+        self.in_progress = set()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+
+    def touch(self, path):
+        """
+        Register a (possibly still growing) file as a candidate for processing. Files that
+        already have a result, error or duplicate marker are ignored.
+        """
+        if not path.lower().endswith(".pdf") or self._has_output(path):
+            return
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return
+        with self.lock:
+            if path in self.in_progress:
+                return
+            previous = self.pending.get(path)
+            if previous is None or previous[:2] != (stat.st_size, stat.st_mtime):
+                self.pending[path] = (stat.st_size, stat.st_mtime, time.monotonic())
+
+    def scan(self):
+        """
+        Register every PDF in the folder that has no result or error file yet.
+        """
+        for entry in os.scandir(self.watch_dir):
+            if entry.is_file():
+                self.touch(entry.path)
+
+    def run(self):
+        """
+        Watch the folder until stop() is called or the process is interrupted.
+        """
+        logger.info(f"Watching {self.watch_dir} ({'polling' if self.use_polling else 'inotify'}) "
+                    f"for {self.document_type} documents")
+        observer = None
+        if not self.use_polling:
+            observer = Observer()
+            observer.schedule(_EventHandler(self), self.watch_dir, recursive=False)
+            observer.start()
+        self.scan()
+        last_scan = time.monotonic()
+        try:
+            while not self.stop_event.wait(1.0):
+                if self.use_polling and time.monotonic() - last_scan >= self.poll_interval:
+                    self.scan()
+                    last_scan = time.monotonic()
+                self._dispatch_stable_files()
+        except KeyboardInterrupt:
+            logger.info("Stopping watcher")
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            self.executor.shutdown(wait=True)
+
+    def stop(self):
+        """
+        Ask the watcher loop to exit.
+        """
+        self.stop_event.set()
+
+    def _dispatch_stable_files(self):
+        """
+        Submit files whose size and mtime have not changed for the debounce period.
+        """
+        now = time.monotonic()
+        ready = []
+        with self.lock:
+            for path, (size, mtime, changed_at) in list(self.pending.items()):
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    del self.pending[path]
+                    continue
+                if (stat.st_size, stat.st_mtime) != (size, mtime):
+                    self.pending[path] = (stat.st_size, stat.st_mtime, now)
+                elif now - changed_at >= self.debounce_seconds and size > 0:
+                    del self.pending[path]
+                    self.in_progress.add(path)
+                    ready.append(path)
+        for path in ready:
+            self.executor.submit(self._process, path)
+
+    def _process(self, path):
+        """
+        Run the pipeline for a single file and write its result or error beside it.
+        """
+        base_path = os.path.splitext(path)[0]
+        name = os.path.basename(path)
+        content_hash = None
+        retry_later = False
+        try:
+            content_hash = file_hash(path)
+            with self.lock:
+                in_flight = self.reserved_hashes.get(content_hash)
+                original = self.processed_hashes.get(content_hash)
+                if in_flight is None and original in (None, name):
+                    self.reserved_hashes[content_hash] = name
+            if in_flight is not None:
+                # Same content is being processed right now; decide once that run has finished
+                logger.info(f"Deferring {path} until {in_flight} has been processed")
+                content_hash = None
+                retry_later = True
+                return
+            if original not in (None, name):
+                content_hash = None
+                logger.info(f"Skipping duplicate file {path} (already processed as {original})")
+                # The marker keeps scan() from picking the file up again
+                write_atomic(base_path + DUPLICATE_SUFFIX, f"Duplicate of {original}\n")
+                return
+            logger.info(f"Processing {path}")
+            started = time.monotonic()
+            result = process_pdf_file(path, self.document_type)
+            write_atomic(base_path + RESULT_SUFFIX, result)
+            with self.lock:
+                self.processed_hashes[content_hash] = os.path.basename(path)
+                self._save_hashes()
+            logger.info(f"Processed {path} in {time.monotonic() - started:.1f}s")
+        except Exception as e:
+            logger.error(f"Error processing {path}: {str(e)}", exc_info=True)
+            write_atomic(base_path + ERROR_SUFFIX, f"Error processing PDF: {str(e)}\n")
+        finally:
+            with self.lock:
+                self.in_progress.discard(path)
+                if content_hash is not None:
+                    self.reserved_hashes.pop(content_hash, None)
+            if retry_later:
+                self.touch(path)
+
+    def _has_output(self, path):
+        base_path = os.path.splitext(path)[0]
+        return any(os.path.exists(base_path + suffix) for suffix in (RESULT_SUFFIX, ERROR_SUFFIX, DUPLICATE_SUFFIX))
+
+    def _load_hashes(self):
+        if not os.path.exists(self.hashes_path):
+            return {}
+        try:
+            with open(self.hashes_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable hash file {self.hashes_path}: {str(e)}")
+            return {}
+
+    def _save_hashes(self):
+        write_atomic(self.hashes_path, json.dumps(self.processed_hashes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Automatically process PDFs dropped into a folder.")
+    parser.add_argument("watch_dir", help="Folder to watch")
+    parser.add_argument("--document-type", default="Invoice",
+                        choices=["Invoice", "Timesheet", "Digital Invoice and Timesheet", "Multiple Timesheets"])
+    parser.add_argument("--workers", type=int, default=4, help="Number of files processed concurrently")
+    parser.add_argument("--debounce", type=float, default=5.0,
+                        help="Seconds a file must stay unchanged before it is processed")
+    parser.add_argument("--poll", action="store_true",
+                        help="Poll instead of using inotify (needed for most network shares)")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between folder scans when polling")
+    args = parser.parse_args()
+
+    load_dotenv()
+    HotFolderWatcher(
+        args.watch_dir,
+        document_type=args.document_type,
+        workers=args.workers,
+        debounce_seconds=args.debounce,
+        poll_interval=args.poll_interval,
+        use_polling=args.poll
+    ).run()
+
+
+if __name__ == "__main__":
+    main()